@@ -0,0 +1,91 @@
+import atexit
+import queue
+import threading
+import time
+
+from config import get_setting
+from metrics import metrics
+
+# Step transitions go onto an in-memory queue; a background writer batch-inserts them and keeps the
+# funnel rollups current, so a request thread never waits on disk
+
+FUNNEL_STEPS = ("details", "skills", "ratings", "verification", "recommendations", "pdf")
+
+
+class AnalyticsQueue:
+    def __init__(self, url: str, max_queue: int = 10000, batch_size: int = 200, flush_interval: float = 2.0):
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.events = queue.Queue(maxsize=max_queue)
+        self.store = None
+        self._store_ready = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="elevatiq-analytics", daemon=True)
+        self._writer.start()
+
+    def track(self, event: str, session_id: str, profession: str = None, **fields):
+        record = {"ts": time.time(), "event": event, "session_id": session_id, "profession": profession, **fields}
+        try:
+            self.events.put_nowait(record)
+        except queue.Full:
+            # Losing an analytics event is better than stalling a user's rerun
+            metrics.inc("elevatiq_analytics_dropped_total")
+
+    def _write_loop(self):
+        # SQLAlchemy is imported and the schema created here, off the request path
+        from analytics_store import AnalyticsStore
+        self.store = AnalyticsStore(self.url)
+        self._store_ready.set()
+        while True:
+            batch = [self.events.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.events.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                with metrics.timer("elevatiq_analytics_write_seconds"):
+                    self.store.write(batch)
+                metrics.inc("elevatiq_analytics_events_total", len(batch))
+            except Exception:
+                metrics.inc("elevatiq_analytics_write_errors_total")
+            finally:
+                for _ in batch:
+                    self.events.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        # Waits until every queued event is written (used at shutdown and by reports that need fresh rollups)
+        deadline = time.monotonic() + timeout
+        while self.events.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self.events.unfinished_tasks
+
+    def funnel(self, profession: str = None) -> list:
+        if not self._store_ready.wait(timeout=5):
+            return []
+        return self.store.funnel(profession)
+
+
+_analytics = None
+_analytics_lock = threading.Lock()
+
+
+def get_analytics() -> AnalyticsQueue:
+    global _analytics
+    with _analytics_lock:
+        if _analytics is None:
+            _analytics = AnalyticsQueue(
+                get_setting("analytics", "url", "sqlite:///elevatiq_analytics.db"),
+                max_queue=get_setting("analytics", "max_queue", 10000),
+                batch_size=get_setting("analytics", "batch_size", 200),
+                flush_interval=get_setting("analytics", "flush_interval_seconds", 2.0),
+            )
+            metrics.register_gauge("elevatiq_analytics_queue_depth", _analytics.events.qsize)
+            atexit.register(_analytics.flush)
+        return _analytics
+
+
+def track_step(step: str, session_id: str, profession: str, **fields):
+    if get_setting("analytics", "enabled", True):
+        get_analytics().track("step", session_id, profession, step=step, **fields)
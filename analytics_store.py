@@ -0,0 +1,123 @@
+import json
+
+from sqlalchemy import Column, Float, Integer, String, Text, and_, func, insert, select, tuple_, update
+from sqlalchemy.orm import declarative_base
+
+from analytics import FUNNEL_STEPS
+from db import make_engine
+from professions import profession_key
+
+Base = declarative_base()
+
+
+class AnalyticsEvent(Base):
+    __tablename__ = "analytics_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ts = Column(Float, nullable=False, index=True)
+    event = Column(String(32), nullable=False)
+    session_id = Column(String(128), nullable=False, index=True)
+    profession = Column(String(200))
+    step = Column(String(32))
+    skill_count = Column(Integer)
+    avg_score = Column(Float)
+    latency_ms = Column(Float)
+    payload = Column(Text)
+
+
+class SessionStep(Base):
+    # One row per (session, step) reached, so reruns and repeated clicks count a session once
+    __tablename__ = "analytics_session_steps"
+
+    session_id = Column(String(128), primary_key=True)
+    step = Column(String(32), primary_key=True)
+
+
+class FunnelRollup(Base):
+    __tablename__ = "analytics_funnel"
+
+    profession = Column(String(200), primary_key=True)
+    step = Column(String(32), primary_key=True)
+    sessions = Column(Integer, nullable=False, default=0)
+    latency_ms_total = Column(Float, nullable=False, default=0.0)
+    latency_samples = Column(Integer, nullable=False, default=0)
+    score_total = Column(Float, nullable=False, default=0.0)
+    score_samples = Column(Integer, nullable=False, default=0)
+
+
+EVENT_COLUMNS = ("ts", "event", "session_id", "profession", "step", "skill_count", "avg_score", "latency_ms")
+
+
+class AnalyticsStore:
+    def __init__(self, url: str):
+        self.engine = make_engine(url)
+        Base.metadata.create_all(self.engine)
+
+    def write(self, batch: list):
+        rows = []
+        for record in batch:
+            record = dict(record)
+            if record.get("profession"):
+                record["profession"] = profession_key(record["profession"])
+            row = {column: record.pop(column, None) for column in EVENT_COLUMNS}
+            row["payload"] = json.dumps(record, default=str) if record else None
+            rows.append(row)
+        with self.engine.begin() as connection:
+            connection.execute(insert(AnalyticsEvent), rows)
+            self._roll_up(connection, [row for row in rows if row["event"] == "step" and row["step"]])
+
+    def _roll_up(self, connection, steps: list):
+        if not steps:
+            return
+        pairs = {(row["session_id"], row["step"]) for row in steps}
+        seen = set(connection.execute(
+            select(SessionStep.session_id, SessionStep.step).where(tuple_(SessionStep.session_id, SessionStep.step).in_(list(pairs)))
+        ).all())
+        increments = {}
+        for row in steps:
+            pair = (row["session_id"], row["step"])
+            key = (row["profession"] or "unknown", row["step"])
+            totals = increments.setdefault(key, {"sessions": 0, "latency_ms_total": 0.0, "latency_samples": 0, "score_total": 0.0, "score_samples": 0})
+            if pair not in seen:
+                seen.add(pair)
+                connection.execute(insert(SessionStep).values(session_id=pair[0], step=pair[1]))
+                totals["sessions"] += 1
+            if row["latency_ms"] is not None:
+                totals["latency_ms_total"] += row["latency_ms"]
+                totals["latency_samples"] += 1
+            if row["avg_score"] is not None:
+                totals["score_total"] += row["avg_score"]
+                totals["score_samples"] += 1
+        for (profession, step), totals in increments.items():
+            where = and_(FunnelRollup.profession == profession, FunnelRollup.step == step)
+            updated = connection.execute(
+                update(FunnelRollup).where(where).values(**{column: getattr(FunnelRollup, column) + value for column, value in totals.items()})
+            )
+            if updated.rowcount == 0:
+                connection.execute(insert(FunnelRollup).values(profession=profession, step=step, **totals))
+
+    def funnel(self, profession: str = None) -> list:
+        # Reads only the rollup table: one row per (profession, step), never the raw events
+        query = select(
+            FunnelRollup.step,
+            func.sum(FunnelRollup.sessions),
+            func.sum(FunnelRollup.latency_ms_total), func.sum(FunnelRollup.latency_samples),
+            func.sum(FunnelRollup.score_total), func.sum(FunnelRollup.score_samples),
+        ).group_by(FunnelRollup.step)
+        if profession:
+            query = query.where(FunnelRollup.profession == profession_key(profession))
+        with self.engine.connect() as connection:
+            totals = {row[0]: row[1:] for row in connection.execute(query)}
+        rows = []
+        previous = None
+        for step in FUNNEL_STEPS:
+            sessions, latency_total, latency_samples, score_total, score_samples = totals.get(step, (0, 0.0, 0, 0.0, 0))
+            rows.append({
+                "step": step,
+                "sessions": sessions,
+                "drop_off": 1 - sessions / previous if previous else 0.0,
+                "avg_latency_ms": latency_total / latency_samples if latency_samples else None,
+                "avg_score": score_total / score_samples if score_samples else None,
+            })
+            previous = sessions
+        return rows
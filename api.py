@@ -0,0 +1,298 @@
+import asyncio
+import hmac
+import json
+from urllib.parse import parse_qs
+
+from analytics import get_analytics
+from concurrency import LimiterTimeout
+from config import get_setting
+from learning_path import PHASES
+from link_check import validate_learning_path
+from metrics import PROMETHEUS_CONTENT_TYPE, metrics
+from pdf_export import get_pdf_exporter
+from pipeline import (
+    fetch_suggested_skills, fetch_trending_skills, get_learning_path,
+    get_verification_questions_and_prerequisites, score_verification_answers,
+)
+from professions import resolve_profession
+from structured_output import StructuredOutputError
+from trending import TrendingUnavailableError
+
+# Stateless JSON API over the same pipeline, caches and clients as the Streamlit UI.
+# Every request carries all of its inputs, so any replica can serve it: uvicorn api:app
+
+
+LEARNING_PATH_ITEM_KEYS = ("skill", "type", "name", "url", "rationale")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def require(payload: dict, key: str, kind=str):
+    value = payload.get(key)
+    if not isinstance(value, kind) or (kind is str and not value.strip()):
+        raise ApiError(400, f"'{key}' is required and must be a {kind.__name__}")
+    return value.strip() if kind is str else value
+
+
+def optional(payload: dict, key: str, kind, default):
+    value = payload.get(key, default)
+    if not isinstance(value, kind):
+        raise ApiError(400, f"'{key}' must be a {kind.__name__}")
+    return value
+
+
+def is_score(value, low: int) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and low <= value <= 10
+
+
+def ratings_from(payload: dict) -> dict:
+    ratings = require(payload, "ratings", dict)
+    if not ratings:
+        raise ApiError(400, "'ratings' must not be empty")
+    if not all(is_score(v, 1) for v in ratings.values()):
+        raise ApiError(400, "'ratings' values must be integers from 1 to 10")
+    return ratings
+
+
+def scores_from(payload: dict) -> dict:
+    scores = optional(payload, "scores", dict, {})
+    if not all(is_score(v, 0) for v in scores.values()):
+        raise ApiError(400, "'scores' values must be integers from 0 to 10")
+    return scores
+
+
+def prerequisites_from(payload: dict) -> dict:
+    prerequisites = optional(payload, "prerequisites", dict, {})
+    if not all(isinstance(v, str) for v in prerequisites.values()):
+        raise ApiError(400, "'prerequisites' values must be strings")
+    return prerequisites
+
+
+def trending_skills_from(payload: dict):
+    # None when the caller left them out, so recommendations can fetch them
+    trending_skills = payload.get("trending_skills")
+    if trending_skills is not None and not (isinstance(trending_skills, list) and all(isinstance(s, str) for s in trending_skills)):
+        raise ApiError(400, "'trending_skills' must be a list of strings")
+    return trending_skills
+
+
+def answers_from(payload: dict, required: bool) -> dict:
+    answers = require(payload, "answers", dict) if required else optional(payload, "answers", dict, {})
+    if required and not answers:
+        raise ApiError(400, "'answers' must not be empty")
+    if not all(isinstance(v, str) for v in answers.values()):
+        raise ApiError(400, "'answers' values must be strings")
+    return answers
+
+
+def questions_from(payload: dict) -> dict:
+    questions = optional(payload, "questions", dict, {})
+    if not all(isinstance(v, dict) and isinstance(v.get("question", ""), str) for v in questions.values()):
+        raise ApiError(400, "'questions' values must be objects with a 'question' string")
+    return questions
+
+
+def learning_path_from(payload: dict) -> dict:
+    # Same shape get_learning_path returns: every phase, each with header, focus and complete items
+    learning_path = require(payload, "learning_path", dict)
+    for phase in PHASES:
+        entry = learning_path.get(phase)
+        if not isinstance(entry, dict) or not all(key in entry for key in ("header", "focus", "items")):
+            raise ApiError(400, f"'learning_path' needs a '{phase}' phase with 'header', 'focus' and 'items'")
+        if not all(isinstance(entry[key], (str, type(None))) for key in ("header", "focus")) or not isinstance(entry["items"], list):
+            raise ApiError(400, f"'learning_path.{phase}' has 'header' and 'focus' strings (or null) and an 'items' list")
+        for item in entry["items"]:
+            if not isinstance(item, dict) or not all(isinstance(item.get(key), str) for key in LEARNING_PATH_ITEM_KEYS):
+                raise ApiError(400, f"'learning_path.{phase}' items need string {', '.join(LEARNING_PATH_ITEM_KEYS)}")
+    return learning_path
+
+
+def profession_from(payload: dict) -> str:
+    # Canonical name, so API callers share caches with each other and with the UI
+    return resolve_profession(require(payload, "profession"))
+
+
+def session_id_for(payload: dict) -> str:
+    # Callers may pass a stable client id so the fair limiter can balance them against each other
+    return f"api:{payload.get('client_id') or 'anonymous'}"
+
+
+def suggest_skills(payload: dict) -> dict:
+    profession = profession_from(payload)
+    skills = fetch_suggested_skills(profession, session_id_for(payload))
+    if skills and skills[0].startswith("Error:"):
+        raise ApiError(503, ", ".join(skills))
+    return {"profession": profession, "skills": skills}
+
+
+def verification(payload: dict) -> dict:
+    questions, prerequisites = get_verification_questions_and_prerequisites(
+        profession_from(payload), ratings_from(payload), session_id_for(payload)
+    )
+    return {"questions": questions, "prerequisites": prerequisites}
+
+
+def scores(payload: dict) -> dict:
+    result, errors = score_verification_answers(
+        profession_from(payload), questions_from(payload), answers_from(payload, required=True), session_id_for(payload)
+    )
+    return {"scores": result, "errors": errors}
+
+
+def recommendations(payload: dict) -> dict:
+    profession = profession_from(payload)
+    ratings, answers, scores, prerequisites = (
+        ratings_from(payload), answers_from(payload, required=False), scores_from(payload), prerequisites_from(payload)
+    )
+    trending_skills = trending_skills_from(payload)
+    if trending_skills is None:
+        trending_skills = trending_or_error(profession)
+    learning_path = get_learning_path(
+        profession,
+        ratings,
+        answers,
+        scores,
+        prerequisites,
+        trending_skills,
+        session_id_for(payload),
+    )
+    validate_learning_path(learning_path)
+    return {"learning_path": learning_path, "trending_skills": trending_skills}
+
+
+def trending_or_error(profession: str) -> list:
+    try:
+        return fetch_trending_skills(profession)
+    except Exception:
+        return ["Error fetching trends"]
+
+
+def trending(payload: dict) -> dict:
+    profession = profession_from(payload)
+    return {"profession": profession, "skills": fetch_trending_skills(profession)}
+
+
+def pdf(payload: dict) -> bytes:
+    _, future = get_pdf_exporter().submit(
+        require(payload, "name"),
+        profession_from(payload),
+        ratings_from(payload),
+        scores_from(payload),
+        learning_path_from(payload),
+        trending_skills_from(payload) or [],
+    )
+    return future.result()
+
+
+def health(payload: dict) -> dict:
+    return {"status": "ok"}
+
+
+def funnel(payload: dict) -> dict:
+    profession = payload.get("profession") or None
+    return {"profession": profession, "steps": get_analytics().funnel(profession)}
+
+
+def prometheus(payload: dict) -> str:
+    return metrics.render_prometheus()
+
+
+ROUTES = {
+    ("GET", "/api/health"): health,
+    ("GET", "/api/metrics"): prometheus,
+    ("GET", "/api/analytics/funnel"): funnel,
+    ("POST", "/api/skills"): suggest_skills,
+    ("POST", "/api/verification"): verification,
+    ("POST", "/api/scores"): scores,
+    ("POST", "/api/recommendations"): recommendations,
+    ("GET", "/api/trending"): trending,
+    ("POST", "/api/pdf"): pdf,
+}
+# Process internals, shown in the UI only behind admin.token; callers send "Authorization: Bearer <admin.token>"
+ADMIN_ROUTES = {prometheus, funnel}
+
+
+def require_admin(authorization: str):
+    # Without a configured token the routes don't exist, as in the UI
+    token = get_setting("admin", "token", "")
+    if not token:
+        raise ApiError(404, "Not found")
+    scheme, _, presented = authorization.partition(" ")
+    if scheme.casefold() != "bearer" or not hmac.compare_digest(presented.strip().encode(), token.encode()):
+        raise ApiError(401, "Admin token required")
+
+
+def handle(method: str, path: str, query: str, body: bytes, authorization: str = "") -> tuple:
+    handler = ROUTES.get((method, path.rstrip("/") or "/"))
+    if handler is None:
+        raise ApiError(404, f"No route for {method} {path}")
+    if handler in ADMIN_ROUTES:
+        require_admin(authorization)
+    if method == "GET":
+        payload = {key: values[-1] for key, values in parse_qs(query).items()}
+    else:
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise ApiError(400, "Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+    try:
+        with metrics.timer("elevatiq_api_request_seconds", route=handler.__name__):
+            return 200, handler(payload)
+    except (StructuredOutputError, TrendingUnavailableError, LimiterTimeout) as e:
+        raise ApiError(503, str(e))
+
+
+async def read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def respond(send, status: int, result):
+    if isinstance(result, bytes):
+        content_type, payload = b"application/pdf", result
+    elif isinstance(result, str):
+        content_type, payload = PROMETHEUS_CONTENT_TYPE.encode(), result.encode("utf-8")
+    else:
+        content_type, payload = b"application/json", json.dumps(result).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(payload)).encode())],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+    body = await read_body(receive)
+    query = scope.get("query_string", b"").decode("latin-1")
+    authorization = dict(scope.get("headers", [])).get(b"authorization", b"").decode("latin-1")
+    try:
+        # Pipeline calls block on Gemini/X, so they run on the default thread pool, not the event loop
+        status, result = await asyncio.get_running_loop().run_in_executor(
+            None, handle, scope["method"], scope["path"], query, body, authorization
+        )
+    except ApiError as e:
+        status, result = e.status, {"error": str(e)}
+    except Exception as e:
+        status, result = 500, {"error": f"Unexpected error: {e}"}
+    await respond(send, status, result)
@@ -1,118 +1,59 @@
 import streamlit as st
-import requests
+import hmac
 import re
-import tweepy
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-import io
 import time
+from functools import partial
+import pipeline
+from pipeline import (
+    current_session_id, fetch_suggested_skills, fetch_trending_skills, gemini_error_message,
+    get_learning_path, stream_dynamic_recommendations,
+)
+from config import get_setting
+from gemini_client import GeminiError
+from learning_path import LearningPathParser, learning_path_events, learning_path_fingerprint
+from link_check import DEAD, prefetch_links, validate_learning_path
+from prefetch import start_profession_prefetch
+from trending import TrendingUnavailableError
+from professions import normalize_profession, resolve_profession
+from pdf_export import get_pdf_exporter, pdf_fingerprint
+from concurrency import LimiterTimeout
+from structured_output import StructuredOutputError
+from metrics import metrics, start_metrics_server
+from analytics import get_analytics, track_step
+from resume import get_checkpoint_store, new_resume_token, snapshot
+from static_assets import SIDEBAR_HTML, get_logo_bytes, get_splash_markup, get_stylesheet
 
 # Set page config as the first command
 st.set_page_config(page_title="ElevatIQ", page_icon="📚", layout="wide")
 
-# Load Custom CSS from external file
-with open("styles.css", "r") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-# Add custom splash screen and animation CSS/JavaScript
-st.markdown("""
-    <style>
-        .splash-screen {
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: #ffffff;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            flex-direction: column;
-            z-index: 1000;
-            animation: fadeOut 1s ease-in-out forwards;
-            animation-delay: 3s;
-        }
-
-        .logo-animation {
-            width: 200px;
-            height: 200px;
-            animation: pulse 1.5s infinite alternate, rotate 4s linear infinite;
-        }
-
-        @keyframes pulse {
-            from { transform: scale(1); }
-            to { transform: scale(1.1); }
-        }
-
-        @keyframes rotate {
-            from { transform: rotate(0deg); }
-            to { transform: rotate(360deg); }
-        }
-
-        @keyframes fadeOut {
-            to { opacity: 0; visibility: hidden; }
-        }
-
-        .main-content {
-            opacity: 0;
-            animation: fadeIn 1s ease-in-out forwards;
-            animation-delay: 3.5s;
-        }
-
-        @keyframes fadeIn {
-            from { opacity: 0; }
-            to { opacity: 1; }
-        }
-    </style>
-    <div class="splash-screen">
-        <img src="https://raw.githubusercontent.com/MrSingh529/elevatiq/main/assets/images/logo.png" alt="ElevatIQ Logo" class="logo-animation">
-        <p style="color: #4c51bf; font-size: 24px; margin-top: 20px;">Loading ElevatIQ...</p>
-    </div>
-    <div class="main-content">
-""", unsafe_allow_html=True)
-
-# Google Gemini API Setup
-GEMINI_API_KEY = st.secrets["api_keys"]["gemini_api_key"]
-GEMINI_ENDPOINT = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
-
-client = tweepy.Client(bearer_token=st.secrets["x_api"]["bearer_token"])
-
-@st.cache_data
-def get_gemini_response(prompt: str) -> str:
-    headers = {"Content-Type": "application/json"}
-    body = {"contents": [{"parts": [{"text": prompt}]}]}
-    try:
-        response = requests.post(GEMINI_ENDPOINT, headers=headers, json=body)
-        if response.status_code == 200:
-            return response.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
-        else:
-            return f"Error: Received status code {response.status_code}"
-    except Exception as e:
-        return f"Error: {e}"
+# Custom CSS, read once per process
+st.markdown(get_stylesheet(), unsafe_allow_html=True)
+
+# The splash covers a session's first run only, and is removed as soon as that run has rendered
+# the page (see the bottom of this file) rather than after a fixed delay
+splash = st.empty()
+if not st.session_state.get("splash_done"):
+    splash.markdown(get_splash_markup(), unsafe_allow_html=True)
+st.markdown("<div class='main-content'>", unsafe_allow_html=True)
 
-def get_trending_skills(profession: str) -> list:
+STREAM_RECOMMENDATIONS = get_setting("gemini", "stream_recommendations", True)
+BATCH_RENDERING = get_setting("ui", "batch_rendering", True)
+ADMIN_TOKEN = get_setting("admin", "token", "")
+
+# Prometheus scrape endpoint for this process (Streamlit itself cannot serve extra routes)
+METRICS_PORT = get_setting("metrics", "port", 0)
+if METRICS_PORT:
+    start_metrics_server(METRICS_PORT)
+
+def get_trending_skills(profession: str, prefetched=None) -> list:
+    import tweepy
     try:
-        query = f"trending skills {profession} -is:retweet"
-        tweets = client.search_recent_tweets(query=query, max_results=50, tweet_fields=["created_at"])
-
-        skill_keywords = ["python", "javascript", "java", "cloud", "ai", "machine learning", "data analysis", "devops", "design"]
-        trending_skills = []
-        skill_count = {}
-
-        for tweet in tweets.data or []:
-            text = tweet.text.lower()
-            for skill in skill_keywords:
-                if skill in text and skill not in trending_skills:
-                    skill_count[skill] = skill_count.get(skill, 0) + 1
-                    if skill_count[skill] > 1 and len(trending_skills) < 5:
-                        trending_skills.append(skill.title())
-
-        if not trending_skills:
-            trending_skills = ["No trending skills found"]
-        return trending_skills[:5]
+        if prefetched is not None:
+            return prefetched.result()
+        return fetch_trending_skills(profession)
+    except TrendingUnavailableError:
+        st.warning("Trending skills from X are temporarily unavailable. Please try again shortly.")
+        return ["Error fetching trends"]
     except tweepy.TweepyException as e:
         st.error(f"Error fetching trending skills from X: {e}")
         return ["Error fetching trends"]
@@ -181,6 +122,30 @@ if "form_submitted" not in st.session_state:
     st.session_state.language = "English"
     st.session_state.trending_skills = []
     st.session_state.prerequisites = {}
+    st.session_state.learning_path = None
+    st.session_state.prefetch = {}
+
+def restore_checkpoint(token: str, data: dict):
+    for field, value in data.items():
+        st.session_state[field] = value
+    st.session_state.resume_token = token
+    st.query_params["resume"] = token
+
+def save_checkpoint():
+    # Called after each completed stage; a returning session picks up from here without new Gemini calls
+    st.session_state.resumed = False
+    if st.session_state.get("resume_token"):
+        get_checkpoint_store().save(st.session_state.resume_token, snapshot(st.session_state))
+
+# A reconnect or server restart arrives as a fresh session; the resume token in the URL restores its progress.
+# The unguessable token is the only way back in: nothing is ever restored from an email address or a name
+if "resume_token" not in st.session_state:
+    st.session_state.resume_token = None
+    token = st.query_params.get("resume")
+    checkpoint = get_checkpoint_store().load(token) if token else None
+    if checkpoint:
+        restore_checkpoint(token, checkpoint)
+        st.session_state.resumed = True
 
 # Functions
 def validate_input(name: str, email: str, profession: str) -> bool:
@@ -189,185 +154,169 @@ def validate_input(name: str, email: str, profession: str) -> bool:
             re.match(email_pattern, email) is not None and 
             profession.strip() != "")
 
+def record_step(step: str, started: float = None, **fields):
+    # Queued for the background analytics writer; never waits on disk
+    if started is not None:
+        fields["latency_ms"] = (time.perf_counter() - started) * 1000
+    track_step(step, current_session_id(), st.session_state.profession, **fields)
+
 def submit_details():
     if validate_input(st.session_state.input_name, st.session_state.input_email, st.session_state.input_profession):
         st.session_state.name = st.session_state.input_name
         st.session_state.email = st.session_state.input_email
-        st.session_state.profession = st.session_state.input_profession
+        # Canonical name, so every spelling of a profession shares suggestions, trending searches and cached responses
+        st.session_state.profession = resolve_profession(st.session_state.input_profession)
         st.session_state.form_submitted = True
-        suggest_skills()
+        if not st.session_state.resume_token:
+            st.session_state.resume_token = new_resume_token()
+        st.query_params["resume"] = st.session_state.resume_token
+        save_checkpoint()
+        record_step("details")
+        # Profession-only work runs in the background while the user moves through Steps 2-4
+        st.session_state.prefetch = start_profession_prefetch(st.session_state.profession, {
+            "suggested_skills": partial(fetch_suggested_skills, session_id=current_session_id()),
+            "trending_skills": fetch_trending_skills,
+        })
         st.success(f"{lang['welcome']} Let's get started, {st.session_state.name}!")
+        if normalize_profession(st.session_state.profession) != normalize_profession(st.session_state.input_profession):
+            st.caption(f"Tailoring your journey for: {st.session_state.profession}")
     else:
         st.error("Please provide a valid name, email, and profession.")
 
-def suggest_skills():
-    prompt = (
-        f"You are an expert career advisor. For a '{st.session_state.profession}', "
-        f"suggest 8-10 key skills that are essential for success in this profession. "
-        f"Return the skills as a comma-separated list (e.g., 'Python, Machine Learning, Data Analysis')."
-    )
-    skills_response = get_gemini_response(prompt)
-    st.session_state.suggested_skills = [skill.strip() for skill in skills_response.split(",") if skill.strip()]
+def suggest_skills(prefetched=None):
+    if prefetched is not None:
+        st.session_state.suggested_skills = prefetched.result()
+    else:
+        st.session_state.suggested_skills = fetch_suggested_skills(st.session_state.profession)
 
 def get_verification_questions_and_prerequisites(skills: dict) -> tuple:
-    skill_ratings = "\n".join([f"{skill}: {rating}/10" for skill, rating in skills.items()])
-    prompt = (
-        f"You are an expert in skill assessment. For a {st.session_state.profession}, "
-        f"the user has rated their skills as follows:\n{skill_ratings}\n"
-        f"1. Generate one open-ended question per skill to verify proficiency. "
-        f"2. Provide a brief hint for each question. "
-        f"3. For skills rated below 5/10, suggest one prerequisite skill. "
-        f"Return in format: 'Skill: Question | Hint | Prerequisite (if applicable)' (one per line)."
-    )
-    response = get_gemini_response(prompt)
-    questions = {}
-    prerequisites = {}
-    for line in response.split("\n"):
-        line = line.strip()
-        if line and ": " in line and "|" in line:
-            try:
-                skill, rest = line.split(": ", 1)
-                parts = rest.split(" | ")
-                question, hint = parts[0], parts[1]
-                prereq = parts[2] if len(parts) > 2 else None
-                questions[skill.strip()] = {"question": question.strip(), "hint": hint.strip()}
-                if prereq:
-                    prerequisites[skill.strip()] = prereq.strip()
-            except ValueError:
-                st.warning(f"Skipping malformed line: {line}")
-    return questions, prerequisites
+    try:
+        return pipeline.get_verification_questions_and_prerequisites(st.session_state.profession, skills)
+    except StructuredOutputError as e:
+        st.error(str(e))
+        return {}, {}
 
 def score_verification_answers(answers: dict) -> dict:
     if not answers:
         st.error("No verification answers provided. Please enter answers for each skill.")
         return {}
-    
-    prompt = (
-        f"You are an expert assessor. You are given the following verification answers for a {st.session_state.profession}. "
-        f"Evaluate each answer based on depth and relevance and score it out of 10. The answers are:\n" +
-        "\n".join([f"{skill}: {answer}" for skill, answer in answers.items()]) +
-        "\nReturn the scores in the format: 'Skill: Score' (one per line), where Score is a single integer (e.g., 'Prioritization: 7')."
-    )
-    response = get_gemini_response(prompt)
-    scores = {}
-    for line in response.split("\n"):
-        line = line.strip()
-        if line and ": " in line:
-            try:
-                skill, score = line.split(": ", 1)
-                score = score.strip()
-                if score.isdigit():
-                    scores[skill.strip()] = int(score)
-                else:
-                    st.warning(f"Skipping invalid score for {skill}: '{score}' is not a number")
-            except ValueError as e:
-                st.warning(f"Error processing line '{line}': {e}")
+
+    scores, errors = pipeline.score_verification_answers(st.session_state.profession, st.session_state.verification_questions, answers)
+    for error in errors:
+        st.error(error)
     if not scores:
         st.error("No valid scores were extracted. Please try again.")
     return scores
 
-def get_dynamic_recommendations(profession: str, skills: dict, answers: dict, scores: dict, prerequisites: dict, trending_skills: list) -> str:
-    skill_info = "\n".join([f"{skill}: Self-rated {rating}/10, Verification: {answers.get(skill, 'Not provided')}, Score: {scores.get(skill, 'N/A')}/10, Prerequisite: {prerequisites.get(skill, 'None')}" 
-                           for skill, rating in skills.items()])
-    trending_info = f"Trending skills on X for {profession}: {', '.join(trending_skills)}"
-    prompt = (
-        f"You are an expert education consultant. For a '{profession}', "
-        f"the user has this skill profile:\n{skill_info}\n"
-        f"Additionally, consider these trending skills from X: {trending_info}\n"
-        f"Provide a detailed, personalized learning path with 3 phases (Beginner, Intermediate, Advanced). "
-        f"Use this format for each phase:\n"
-        f"- Phase: [Phase Name] - [Duration]\n"
-        f"  - Focus: [Brief description of focus]\n"
-        f"  - [Skill]: [Resource Type] | [Resource Name] | [URL (if available)] | [Rationale]\n"
-        f"Ensure the output is plain text with one recommendation per line."
-    )
-    return get_gemini_response(prompt)
-
-def export_to_pdf(name: str, profession: str, skills: dict, verification_scores: dict, recommendations: str, trending_skills: list):
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch, rightMargin=0.75*inch, leftMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    
-    # Define styles
-    header_style = ParagraphStyle('Header', parent=styles['Heading1'], fontSize=26, textColor=colors.Color(76/255, 81/255, 191/255), spaceAfter=15, alignment=1, fontName='Helvetica-Bold')
-    subheader_style = ParagraphStyle('Subheader', parent=styles['Heading2'], fontSize=16, textColor=colors.grey, spaceAfter=10, alignment=1, fontName='Helvetica')
-    body_style = ParagraphStyle('Body', parent=styles['BodyText'], fontSize=11, textColor=colors.black, leading=14, alignment=0, fontName='Helvetica')
-    phase_style = ParagraphStyle('Phase', parent=styles['Heading2'], fontSize=14, textColor=colors.Color(45/255, 55/255, 72/255), spaceAfter=8, alignment=1, fontName='Helvetica-Bold')
-
-    story = []
-
-    # Header Section
+def render_recommendation_item(item: dict) -> str:
+    if item["url"] == "N/A":
+        link = ''
+    elif item.get("link_status") == DEAD:
+        link = "<span class='dead-link'>(link unavailable)</span>"
+    else:
+        link = f'<a href="{item["url"]}" target="_blank">Link</a>'
+    return f"""
+        <div class='skill-item'>
+            <div class='skill-title'>📖 {item["skill"]}</div>
+            <div class='resource-details'>
+                <strong>Type:</strong> {item["type"]}<br>
+                <strong>Resource:</strong> {item["name"]} {link}<br>
+                <strong>Rationale:</strong> {item["rationale"]}
+            </div>
+        </div>
+    """
+
+def stream_learning_path_events(chunks, parser: LearningPathParser):
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+def render_event_html(kind: str, payload) -> str:
+    if kind == "phase":
+        return f"<div class='phase-header'>{payload}</div>"
+    if kind == "focus":
+        return f"<div class='resource-details'><strong>Focus:</strong> {payload}</div>"
+    return render_recommendation_item(payload)
+
+def render_recommendations(events, live: bool = False) -> bool:
+    # Fills each phase expander as its events arrive; with streaming (live) this happens line by line.
+    # In batch mode each phase is one markdown element: a live stream re-sends only the phase that
+    # just grew, and a replay sends each phase once
+    expanders = {}
+    placeholders = {}
+    batches = {}
+    phases_with_items = set()
+    status = st.empty()
+    status.info("Generating recommendations...")
     try:
-        logo = Image("assets/images/logo.png", width=1.2*inch, height=1.2*inch)
-        story.append(logo)
-    except:
-        story.append(Paragraph("ElevatIQ", header_style))
-    story.append(Paragraph("Personalized Learning Path Report", header_style))
-    story.append(Paragraph("Empowering Your Professional Growth", body_style))
-    story.append(Spacer(1, 0.3*inch))
-
-    # User Details Section
-    story.append(Paragraph("User Information", subheader_style))
-    story.append(Paragraph(f"<b>Name:</b> {name}", body_style))
-    story.append(Paragraph(f"<b>Profession:</b> {profession}", body_style))
-    story.append(Spacer(1, 0.25*inch))
-
-    # Skills Table Section
-    story.append(Paragraph("Skill Assessment Summary", subheader_style))
-    skills_data = [["Skill", "Self-Rating", "Verification Score"]]
-    for skill, rating in skills.items():
-        v_score = verification_scores.get(skill, "N/A")
-        skills_data.append([skill, f"{rating}/10", f"{v_score}/10" if v_score != "N/A" else "N/A"])
-    skills_table = Table(skills_data, colWidths=[2.5*inch, 1.2*inch, 1.3*inch])
-    skills_table.setStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.Color(76/255, 81/255, 191/255)),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ])
-    story.append(skills_table)
-    story.append(Spacer(1, 0.25*inch))
-
-    # Trending Skills Section
-    story.append(Paragraph("Trending Skills on X", subheader_style))
-    trending_text = f"For {profession}: {', '.join(trending_skills) if trending_skills and trending_skills[0] != 'Error fetching trends' else 'No trending skills available'}"
-    story.append(Paragraph(trending_text, body_style))
-    story.append(Spacer(1, 0.25*inch))
-
-    # Recommendations Section
-    story.append(Paragraph("Recommended Learning Path", subheader_style))
-    phases = ["Beginner", "Intermediate", "Advanced"]
-    current_phase = None
-    for line in recommendations.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        if any(phase.lower() in line.lower() for phase in phases):
-            current_phase = next((phase for phase in phases if phase.lower() in line.lower()), None)
-            story.append(Paragraph(line, phase_style))
-        elif current_phase:
-            story.append(Paragraph(line.replace("\n", "<br />"), body_style))
-        else:
-            story.append(Paragraph(line.replace("\n", "<br />"), body_style))
-    story.append(Spacer(1, 0.25*inch))
-
-    # Footer Section
-    story.append(Paragraph("Report Generated by ElevatIQ | © 2025 ElevatIQ", body_style))
-
-    # Build the PDF
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
+        for phase, kind, payload in events:
+            status.empty()
+            if kind == "phase" and phase not in expanders:
+                expanders[phase] = st.expander(f"📚 {phase} Phase", expanded=True)
+                if BATCH_RENDERING:
+                    placeholders[phase] = expanders[phase].empty()
+                    batches[phase] = []
+            if kind not in ("phase", "focus", "item"):
+                expanders[phase].warning(f"Skipping malformed recommendation: {payload}")
+                continue
+            if kind == "item":
+                phases_with_items.add(phase)
+            if not BATCH_RENDERING:
+                expanders[phase].markdown(render_event_html(kind, payload), unsafe_allow_html=True)
+                continue
+            batches[phase].append(render_event_html(kind, payload))
+            if live:
+                placeholders[phase].markdown("".join(batches[phase]), unsafe_allow_html=True)
+    except (GeminiError, LimiterTimeout) as e:
+        status.error(gemini_error_message(e))
+        return False
+    finally:
+        if BATCH_RENDERING and not live:
+            for phase, placeholder in placeholders.items():
+                placeholder.markdown("".join(batches[phase]), unsafe_allow_html=True)
+    for phase, expander in expanders.items():
+        if phase not in phases_with_items:
+            expander.write("No recommendations available for this phase.")
+    return bool(phases_with_items)
+
+def is_admin() -> bool:
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(st.query_params.get("admin", "").encode(), ADMIN_TOKEN.encode())
+
+def render_diagnostics():
+    # Admin-only (?admin=<admin.token>): where this process spends its time, slowest p95 first
+    summary = metrics.summary()
+    with st.expander("🩺 Diagnostics"):
+        st.caption("Latency (seconds)")
+        st.dataframe(summary["latencies"], hide_index=True)
+        st.caption("Cache hit rates")
+        st.dataframe(summary["hit_rates"], hide_index=True)
+        st.caption("Counters")
+        st.dataframe(summary["counters"], hide_index=True)
+        st.caption("Gauges")
+        st.dataframe(summary["gauges"], hide_index=True)
+        st.caption("Funnel, all professions")
+        st.dataframe(get_analytics().funnel(), hide_index=True)
+        if st.button("Reset metrics"):
+            metrics.reset()
+            st.rerun()
 
 def render_star_rating(skill: str, rating: int):
     stars = "".join(["★" if i < rating else "☆" for i in range(10)])
     return f"<div class='star-rating'>{stars}</div>"
 
+def render_rating_summary(ratings: dict) -> str:
+    return "".join(f"<div class='skill-title'>{skill}</div>{render_star_rating(skill, rating)}" for skill, rating in ratings.items())
+
+def start_over(discard_checkpoint: bool = False):
+    # The checkpoint survives a plain Start Over, so the previous ?resume= link (browser Back) still restores it
+    if discard_checkpoint and st.session_state.get("resume_token"):
+        get_checkpoint_store().delete(st.session_state.resume_token)
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    if "resume" in st.query_params:
+        del st.query_params["resume"]
+    st.rerun()
+
 # Main App
 def main():
     global lang
@@ -375,16 +324,11 @@ def main():
 
     # Sidebar
     with st.sidebar:
-        st.image("assets/images/logo.png", width=150)
-        st.markdown("<h1 style='color: #ffffff;'>ElevatIQ</h1>", unsafe_allow_html=True)
-        st.markdown("""
-            <div style='margin-top: 20px;'>
-                <a href='#' style='color: #edf2f7; text-decoration: none; font-size: 1.1em; display: block; margin: 10px 0;'>🏠 Home</a>
-                <a href='#' style='color: #edf2f7; text-decoration: none; font-size: 1.1em; display: block; margin: 10px 0;'>👤 Profile</a>
-                <a href='#' style='color: #edf2f7; text-decoration: none; font-size: 1.1em; display: block; margin: 10px 0;'>📚 Recommendations</a>
-            </div>
-        """, unsafe_allow_html=True)
+        st.image(get_logo_bytes(), width=150)
+        st.markdown(SIDEBAR_HTML, unsafe_allow_html=True)
         st.session_state.language = st.selectbox("🌐 Language / भाषा", ["English", "Hindi"], format_func=lambda x: f"{x} ({'EN' if x == 'English' else 'HI'})")
+        if is_admin():
+            render_diagnostics()
 
     # Main Content
     st.title(lang["title"])
@@ -425,6 +369,10 @@ def main():
         if submit_clicked:
             submit_details()
     else:
+        if st.session_state.get("resumed"):
+            st.info(f"Welcome back, {st.session_state.name}! We picked up where you left off.")
+            if st.button("Start fresh instead"):
+                start_over(discard_checkpoint=True)
         # User Profile Card
         st.markdown(f"""
             <div style='background: #ffffff; padding: 20px; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); margin-bottom: 20px;'>
@@ -437,6 +385,10 @@ def main():
         # Step 2: Select Skills
         if not st.session_state.selected_skills:
             st.subheader(lang["step2"])
+            if not st.session_state.suggested_skills:
+                # A resumed session has no prefetch; the suggestion prompt is answered from the response cache
+                suggest_skills(st.session_state.prefetch.pop("suggested_skills", None))
+                save_checkpoint()
             st.write(lang["suggested"])
             if st.button("🔄 Suggest More Skills"):
                 suggest_skills()
@@ -450,6 +402,8 @@ def main():
             if selected and st.button(f"✅ {lang['confirm']}"):
                 for skill in selected:
                     st.session_state.selected_skills[skill] = 5
+                record_step("skills", skill_count=len(selected))
+                save_checkpoint()
                 st.success("Skills confirmed! Now rate them.")
                 st.rerun()
 
@@ -459,11 +413,18 @@ def main():
             for skill in st.session_state.selected_skills:
                 rating = st.slider(f"{skill}", 1, 10, st.session_state.selected_skills[skill], key=f"slider_{skill}")
                 st.session_state.selected_skills[skill] = rating
-                st.markdown(render_star_rating(skill, rating), unsafe_allow_html=True)
+                if not BATCH_RENDERING:
+                    st.markdown(render_star_rating(skill, rating), unsafe_allow_html=True)
+            if BATCH_RENDERING:
+                # One element for the whole list instead of one per slider
+                st.markdown(render_rating_summary(st.session_state.selected_skills), unsafe_allow_html=True)
             if st.button("📊 Submit Ratings"):
+                started = time.perf_counter()
                 questions, prereqs = get_verification_questions_and_prerequisites(st.session_state.selected_skills)
+                record_step("ratings", started, skill_count=len(st.session_state.selected_skills), ratings=st.session_state.selected_skills)
                 st.session_state.verification_questions = questions
                 st.session_state.prerequisites = prereqs
+                save_checkpoint()
                 st.success("Ratings submitted! Verify your skills next.")
                 st.rerun()
 
@@ -472,75 +433,65 @@ def main():
             st.subheader(lang["step3"])
             st.write(lang["verify_intro"])
             for skill, data in st.session_state.verification_questions.items():
-                answer = st.text_area(f"{skill}: {data['question']}", key=f"verify_{skill}", placeholder="Provide a detailed answer...")
+                answer = st.text_area(f"{skill}: {data['question']}", st.session_state.verification_answers.get(skill, ""), key=f"verify_{skill}", placeholder="Provide a detailed answer...")
                 st.markdown(f"<div class='hint'>Hint: {data['hint']}</div>", unsafe_allow_html=True)
                 st.session_state.verification_answers[skill] = answer
                 if st.session_state.prerequisites.get(skill):
                     st.info(f"Prerequisite for {skill}: {st.session_state.prerequisites[skill]}")
             if st.button("✔️ Submit Verification"):
+                started = time.perf_counter()
                 st.session_state.verification_scores = score_verification_answers(st.session_state.verification_answers)
+                scores = st.session_state.verification_scores
+                record_step("verification", started, skill_count=len(scores), avg_score=sum(scores.values()) / len(scores) if scores else None)
                 st.session_state.skills_verified = True
+                save_checkpoint()
                 st.success("Verification complete! Check your recommendations.")
                 st.rerun()
 
         # Step 5: Recommendations
         else:
             st.subheader(lang["step4"])
-            with st.spinner("<div style='display: flex; align-items: center;'><img src='https://loading.io/assets/mod/spinner/spinner/lg.gif' width='30'> Generating recommendations...</div>"):
-                if not st.session_state.trending_skills:
-                    st.session_state.trending_skills = get_trending_skills(st.session_state.profession)
-                recommendations = get_dynamic_recommendations(
-                    st.session_state.profession, st.session_state.selected_skills, 
-                    st.session_state.verification_answers, st.session_state.verification_scores, 
-                    st.session_state.prerequisites, st.session_state.trending_skills
-                )
-                recommendations = re.sub(r'(https?://[^\s]+)', r'<a href="\1" target="_blank">\1</a>', recommendations)
+            if not st.session_state.trending_skills:
+                with st.spinner("<div style='display: flex; align-items: center;'><img src='https://loading.io/assets/mod/spinner/spinner/lg.gif' width='30'> Fetching trending skills...</div>"):
+                    st.session_state.trending_skills = get_trending_skills(st.session_state.profession, st.session_state.prefetch.pop("trending_skills", None))
 
             st.markdown("<div class='recommendations'>", unsafe_allow_html=True)
-            phases = {"Beginner": None, "Intermediate": None, "Advanced": None}
-            current_phase = None
-            phase_content = {"Beginner": [], "Intermediate": [], "Advanced": []}
-
-            for line in recommendations.split("\n"):
-                line = line.strip()
-                if not line:
-                    continue
-                for phase in phases.keys():
-                    if phase.lower() in line.lower():
-                        current_phase = phase
-                        phases[phase] = st.expander(f"📚 {phase} Phase", expanded=True)
-                        break
-                if current_phase and line:
-                    phase_content[current_phase].append(line)
-
-            for phase, expander in phases.items():
-                if expander:
-                    with expander:
-                        if phase_content[phase]:
-                            st.markdown(f"<div class='phase-header'>{phase_content[phase][0]}</div>", unsafe_allow_html=True)
-                            for item in phase_content[phase][1:]:
-                                if ": " in item:
-                                    skill, details = item.split(": ", 1)
-                                    parts = [d.strip() for d in details.split(" | ")]
-                                    if len(parts) >= 3:
-                                        resource_type = parts[0]
-                                        resource_name = parts[1]
-                                        url = parts[2] if len(parts) > 2 and parts[2] else "N/A"
-                                        rationale = parts[3] if len(parts) > 3 else "No rationale provided"
-                                        st.markdown(f"""
-                                            <div class='skill-item'>
-                                                <div class='skill-title'>📖 {skill}</div>
-                                                <div class='resource-details'>
-                                                    <strong>Type:</strong> {resource_type}<br>
-                                                    <strong>Resource:</strong> {resource_name} {f'<a href="{url}" target="_blank">Link</a>' if url != "N/A" else ''}<br>
-                                                    <strong>Rationale:</strong> {rationale}
-                                                </div>
-                                            </div>
-                                        """, unsafe_allow_html=True)
-                                    else:
-                                        st.warning(f"Skipping malformed recommendation: {item}")
-                        else:
-                            st.write("No recommendations available for this phase.")
+            recommendation_inputs = (
+                st.session_state.profession, st.session_state.selected_skills,
+                st.session_state.verification_answers, st.session_state.verification_scores,
+                st.session_state.prerequisites, st.session_state.trending_skills
+            )
+            # Filter, trending and export interactions rerun the script; render them from the stored path
+            fingerprint = learning_path_fingerprint(*recommendation_inputs)
+            stored = st.session_state.learning_path
+            started = time.perf_counter()
+            if stored and stored["fingerprint"] == fingerprint:
+                # Links still unchecked (slow sites, older checkpoints) are looked up again; usually from the store
+                if validate_learning_path(stored["path"]):
+                    save_checkpoint()
+                render_recommendations(learning_path_events(stored["path"]))
+            elif STREAM_RECOMMENDATIONS:
+                parser = LearningPathParser()
+                if render_recommendations(prefetch_links(stream_learning_path_events(stream_dynamic_recommendations(*recommendation_inputs), parser)), live=True):
+                    dead_links = sum(item["link_status"] == DEAD for item in validate_learning_path(parser.path))
+                    st.session_state.learning_path = {"fingerprint": fingerprint, "path": parser.path}
+                    save_checkpoint()
+                    record_step("recommendations", started, streamed=True, dead_links=dead_links)
+                    if dead_links:
+                        # Items were streamed before their links were checked; redraw them from the stored path
+                        st.rerun()
+            else:
+                try:
+                    learning_path = get_learning_path(*recommendation_inputs)
+                except StructuredOutputError as e:
+                    st.error(str(e))
+                    learning_path = None
+                if learning_path:
+                    validate_learning_path(learning_path)
+                if learning_path and render_recommendations(learning_path_events(learning_path)):
+                    st.session_state.learning_path = {"fingerprint": fingerprint, "path": learning_path}
+                    save_checkpoint()
+                    record_step("recommendations", started, streamed=False)
             st.markdown("</div>", unsafe_allow_html=True)
 
             # Filters
@@ -563,22 +514,29 @@ def main():
                 st.info("These trending skills have been incorporated into your recommendations.")
 
             # Export PDF
-            if st.button(f"📄 {lang['export']}"):
-                pdf_buffer = export_to_pdf(
+            if st.session_state.learning_path:
+                pdf_inputs = (
                     st.session_state.name,
                     st.session_state.profession,
                     st.session_state.selected_skills,
                     st.session_state.verification_scores,
-                    recommendations,
+                    st.session_state.learning_path["path"],
                     st.session_state.trending_skills
                 )
-                st.download_button("Download PDF", pdf_buffer, "learning_path.pdf", "application/pdf")
+                pdf_exporter = get_pdf_exporter()
+                pdf = pdf_exporter.cached(pdf_fingerprint(*pdf_inputs))
+                if pdf is None and st.button(f"📄 {lang['export']}"):
+                    with st.spinner("Preparing your PDF..."):
+                        started = time.perf_counter()
+                        _, future = pdf_exporter.submit(*pdf_inputs)
+                        pdf = future.result()
+                    record_step("pdf", started)
+                if pdf is not None:
+                    st.download_button("Download PDF", pdf, "learning_path.pdf", "application/pdf")
 
             # Start Over
             if st.button(f"🔄 {lang['start_over']}"):
-                for key in list(st.session_state.keys()):
-                    del st.session_state[key]
-                st.rerun()
+                start_over()
 
     # Footer
     st.markdown("""
@@ -590,4 +548,9 @@ def main():
     """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        with metrics.timer("elevatiq_streamlit_run_seconds"):
+            main()
+    finally:
+        splash.empty()
+        st.session_state.splash_done = True
\ No newline at end of file
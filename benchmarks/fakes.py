@@ -0,0 +1,197 @@
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-ins for Gemini (generateContent / streamGenerateContent) and X (/2/tweets/search/recent)
+# with configurable latency and error rate. Point the app at them with ELEVATIQ_GEMINI_BASE_URL and
+# ELEVATIQ_X_API_BASE_URL; start() returns the base URL to use
+
+SKILLS = ["Python", "SQL", "Machine Learning", "Docker", "Kubernetes", "AWS", "React", "Statistics", "Git", "Communication"]
+TREND_WORDS = ["Python", "SQL", "Docker", "Kubernetes", "AWS", "PyTorch", "TensorFlow", "Rustlang", "Golang", "Terraform", "LLMs", "ReactJS"]
+
+
+class FakeServer:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self.server = None
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json", headers: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _admit(self) -> bool:
+                with fake._lock:
+                    fake.requests += 1
+                    delay = max(0.0, fake.latency + fake.random.uniform(-fake.jitter, fake.jitter))
+                    fail = fake.random.random() < fake.error_rate
+                    if fail:
+                        fake.errors += 1
+                time.sleep(delay)
+                if fail:
+                    self._send(503, b'{"error": "injected failure"}')
+                return not fail
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self._admit():
+                    fake.handle_post(self, self.path, json.loads(body or b"{}"))
+
+            def do_GET(self):
+                if self._admit():
+                    fake.handle_get(self, self.path)
+
+            def do_HEAD(self):
+                if self._admit():
+                    fake.handle_head(self, self.path)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def handle_post(self, handler, path: str, body: dict):
+        handler._send(404, b"{}")
+
+    def handle_get(self, handler, path: str):
+        handler._send(404, b"{}")
+
+    def handle_head(self, handler, path: str):
+        handler._send(405, b"")
+
+
+def prompt_skills(prompt: str) -> list:
+    # Skills as listed by the verification ("Skill: 7/10") and scoring ("Skill: Question: ...") prompts
+    skills = re.findall(r"^(.+?): (?:\d+/10|Question:)", prompt, flags=re.MULTILINE)
+    return skills or SKILLS[:5]
+
+
+class FakeGemini(FakeServer):
+    # Resource URLs point at link_base, e.g. a FakeLinks server, so link validation can be exercised too
+    link_base = "https://example.com"
+
+    def reply(self, prompt: str, structured: bool) -> str:
+        if "comma-separated" in prompt:
+            return ", ".join(SKILLS)
+        if "open-ended question" in prompt:
+            return json.dumps({"questions": [
+                {"skill": skill, "question": f"How have you used {skill}?", "hint": "Give an example", "prerequisite": "Foundations" if i % 3 == 0 else None}
+                for i, skill in enumerate(prompt_skills(prompt))
+            ]})
+        if "score it out of 10" in prompt:
+            return json.dumps({"scores": [{"skill": skill, "score": 3 + len(skill) % 7} for skill in prompt_skills(prompt)]})
+        skills = re.findall(r"^(.+?): Self-rated", prompt, flags=re.MULTILINE) or SKILLS[:3]
+        phases = [("Beginner", "4 weeks"), ("Intermediate", "6 weeks"), ("Advanced", "8 weeks")]
+        if structured:
+            return json.dumps({"phases": [
+                {"name": name, "duration": duration, "focus": f"{name} foundations", "recommendations": [
+                    {"skill": skill, "type": "Course", "name": f"{name} {skill}", "url": f"{self.link_base}/{name.lower()}/{i}", "rationale": f"Builds {skill}"}
+                    for i, skill in enumerate(skills)
+                ]} for name, duration in phases
+            ]})
+        lines = []
+        for name, duration in phases:
+            lines.append(f"- Phase: {name} - {duration}")
+            lines.append(f"  - Focus: {name} foundations")
+            lines.extend(f"  - {skill}: Course | {name} {skill} | {self.link_base}/{name.lower()}/{i} | Builds {skill}" for i, skill in enumerate(skills))
+        return "\n".join(lines)
+
+    def handle_post(self, handler, path: str, body: dict):
+        prompt = body["contents"][0]["parts"][0]["text"]
+        text = self.reply(prompt, "generationConfig" in body)
+        usage = {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4, "totalTokenCount": (len(prompt) + len(text)) // 4}
+        if "streamGenerateContent" in path:
+            chunks = [text[i:i + 80] for i in range(0, len(text), 80)]
+            events = []
+            for i, chunk in enumerate(chunks):
+                payload = {"candidates": [{"content": {"parts": [{"text": chunk}]}}]}
+                if i == len(chunks) - 1:
+                    payload["usageMetadata"] = usage
+                events.append(f"data: {json.dumps(payload)}\r\n\r\n")
+            handler._send(200, "".join(events).encode("utf-8"), "text/event-stream")
+            return
+        payload = {"candidates": [{"content": {"parts": [{"text": text}]}}], "usageMetadata": usage}
+        handler._send(200, json.dumps(payload).encode("utf-8"))
+
+
+class FakeX(FakeServer):
+    def __init__(self, pages: int = 2, page_size: int = 100, **kwargs):
+        super().__init__(**kwargs)
+        self.pages = pages
+        self.page_size = page_size
+
+    def handle_get(self, handler, path: str):
+        url = urlparse(path)
+        if url.path != "/2/tweets/search/recent":
+            handler._send(404, b"{}")
+            return
+        query = parse_qs(url.query)
+        page = int(query.get("next_token", ["0"])[0])
+        size = min(self.page_size, int(query.get("max_results", ["10"])[0]))
+        tweets = [
+            {"id": str(page * size + i), "text": f"Hiring now: {TREND_WORDS[i % len(TREND_WORDS)]} and {TREND_WORDS[(i * 7 + page) % len(TREND_WORDS)]} skills are hot"}
+            for i in range(size)
+        ]
+        meta = {"result_count": len(tweets)}
+        if page + 1 < self.pages:
+            meta["next_token"] = str(page + 1)
+        headers = {"x-rate-limit-remaining": "449", "x-rate-limit-reset": str(int(time.time()) + 900)}
+        handler._send(200, json.dumps({"data": tweets, "meta": meta}).encode("utf-8"), headers=headers)
+
+
+class FakeLinks(FakeServer):
+    # Resource pages for link validation: a stable dead_rate share of paths answer 404, and with
+    # head_allowed=False every HEAD is refused with 405 so the checker has to fall back to GET
+    def __init__(self, dead_rate: float = 0.2, head_allowed: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.dead_rate = dead_rate
+        self.head_allowed = head_allowed
+
+    def is_dead(self, path: str) -> bool:
+        return zlib.crc32(path.encode("utf-8")) % 100 < self.dead_rate * 100
+
+    def handle_get(self, handler, path: str):
+        if self.is_dead(path):
+            handler._send(404, b"not found", "text/plain")
+        else:
+            handler._send(200, b"<html><body>Course page</body></html>", "text/html")
+
+    def handle_head(self, handler, path: str):
+        if not self.head_allowed:
+            handler.send_response(405)
+        else:
+            handler.send_response(404 if self.is_dead(path) else 200)
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
@@ -0,0 +1,280 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+from fakes import FakeGemini, FakeLinks, FakeX
+
+# Load test of the five-step flow against local Gemini/X/resource-link stand-ins:
+#   python benchmarks/load.py --sessions 50 --concurrency 10 [--mode headless|apptest] [--latency 0.2] [--error-rate 0.05]
+# headless mode runs the pipeline exactly as app.py calls it, from many threads at once; apptest mode clicks
+# through the real Streamlit script one session at a time. Reports per-step latency, upstream requests per
+# session and memory per session
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STEPS = ("details", "skills", "rate", "verify", "recommendations", "pdf")
+PROFESSIONS = ["Data Scientist", "Software Engineer", "Product Manager", "DevOps Engineer", "UX Designer", "Data Engineer"]
+# How users actually type them; --spellings rotates through these to exercise profession canonicalization
+SPELLINGS = {
+    "Data Scientist": ["data scientist", "Data Scientist ", "Data Scienist", "data scientists"],
+    "Software Engineer": ["SWE", "software  engineer", "Software Enginer", "software engineer"],
+    "Product Manager": ["product manager", "product mgr", "PRODUCT MANAGER", "Product Managr"],
+    "DevOps Engineer": ["devops engineer", "Dev Ops Engineer", "Devops Engineer", "DevOps Enginer"],
+    "UX Designer": ["ux designer", "User Experience Designer", "UX Desginer", "user experience designer"],
+    "Data Engineer": ["data engineer", "Data Enginer", "DATA ENGINEER", "Data  Engineer"],
+}
+
+
+class Timings:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.samples[name].append(time.perf_counter() - start)
+
+
+def answer_text(index: int, skill: str, sentences: int) -> str:
+    # Verification answers of a chosen length, to see how longer answers move recommendation latency
+    filler = f"We profiled the {skill} service, cut p95 latency by {index % 40 + 10}% and documented the rollout for the team."
+    return " ".join([f"Session {index} used {skill} in production."] + [filler] * (sentences - 1))
+
+
+def headless_session(index: int, profession: str, timings: Timings, sentences: int = 1) -> dict:
+    # The same pipeline calls, in the same order and with the same prefetch, as a Streamlit session
+    from learning_path import LearningPathParser
+    from link_check import prefetch_links, validate_learning_path
+    from pdf_export import get_pdf_exporter
+    from pipeline import (
+        build_recommendation_prompt, fetch_suggested_skills, fetch_trending_skills,
+        get_verification_questions_and_prerequisites, score_verification_answers, stream_gemini_response,
+    )
+    from prefetch import start_profession_prefetch
+    from professions import resolve_profession
+
+    session_id = f"bench:{index}"
+    with timings.step("details"):
+        profession = resolve_profession(profession)
+        prefetch = start_profession_prefetch(profession, {
+            "suggested_skills": partial(fetch_suggested_skills, session_id=session_id),
+            "trending_skills": fetch_trending_skills,
+        })
+    with timings.step("skills"):
+        skills = prefetch["suggested_skills"].result()
+    ratings = {skill: 1 + (index + i) * 3 % 10 for i, skill in enumerate(skills[:5])}
+    with timings.step("rate"):
+        questions, prerequisites = get_verification_questions_and_prerequisites(profession, ratings, session_id)
+    answers = {skill: answer_text(index, skill, sentences) for skill in questions}
+    with timings.step("verify"):
+        scores, _ = score_verification_answers(profession, questions, answers, session_id)
+    with timings.step("recommendations"):
+        try:
+            trending = prefetch["trending_skills"].result()
+        except Exception:
+            trending = ["Error fetching trends"]
+        parser = LearningPathParser()
+        prompt = build_recommendation_prompt(profession, ratings, answers, scores, prerequisites, trending)
+        for chunk in stream_gemini_response(prompt, session_id, stage="recommendations"):
+            list(prefetch_links(parser.feed(chunk)))
+        list(prefetch_links(parser.close()))
+        validate_learning_path(parser.path)
+    with timings.step("pdf"):
+        _, future = get_pdf_exporter().submit(f"Learner {index}", profession, ratings, scores, parser.path, trending)
+        pdf = future.result()
+    return {"ratings": ratings, "questions": questions, "scores": scores, "path": parser.path, "pdf_bytes": len(pdf)}
+
+
+def apptest_session(index: int, profession: str, timings: Timings, sentences: int = 1):
+    from streamlit.testing.v1 import AppTest
+
+    def button(at, label: str):
+        for candidate in at.button:
+            if label in candidate.label:
+                return candidate
+        errors = [e.value for e in at.exception] + [e.value for e in at.error]
+        raise RuntimeError(f"no '{label}' button; have {[b.label for b in at.button]}, errors {errors}")
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.run()
+    with timings.step("details"):
+        at.text_input(key="input_name").input(f"Learner {index}")
+        at.text_input(key="input_email").input(f"learner{index}@example.com")
+        at.text_input(key="input_profession").input(profession)
+        at.button[0].click().run()
+    with timings.step("skills"):
+        at.run()
+        button(at, "Confirm").click().run()
+    with timings.step("rate"):
+        button(at, "Submit Ratings").click().run()
+    for area in at.text_area:
+        area.input(answer_text(index, area.label.split(":")[0], sentences))
+    with timings.step("verify"):
+        button(at, "Submit Verification").click().run()
+    with timings.step("recommendations"):
+        at.run()
+    with timings.step("pdf"):
+        button(at, "Export").click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return at
+
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the ElevatIQ flow against local Gemini and X stand-ins.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--mode", choices=("headless", "apptest"), default="headless")
+    parser.add_argument("--professions", type=int, default=3, help="distinct professions shared across sessions")
+    parser.add_argument("--spellings", action="store_true", help="enter each profession under varying user spellings")
+    parser.add_argument("--answer-sentences", type=int, default=1, help="sentences per verification answer")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of upstream requests answered with 503")
+    parser.add_argument("--dead-links", type=float, default=0.2, help="share of recommended resource URLs that return 404")
+    parser.add_argument("--x-pages", type=int, default=2)
+    parser.add_argument("--tracemalloc", action="store_true", help="measure retained Python memory exactly (slows every step)")
+    parser.add_argument("--json", help="append the results as one JSON line to this file")
+    args = parser.parse_args(argv)
+
+    gemini = FakeGemini(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=1)
+    x = FakeX(pages=args.x_pages, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=2)
+    links = FakeLinks(dead_rate=args.dead_links, latency=args.latency, jitter=args.jitter, seed=3)
+    gemini.link_base = links.start()
+    workdir = tempfile.mkdtemp(prefix="elevatiq-bench-")
+    # Settings are read when the singletons are built, so they must be in place before the app modules load
+    os.environ.update({
+        "ELEVATIQ_GEMINI_BASE_URL": gemini.start() + "/v1beta/models",
+        "ELEVATIQ_X_API_BASE_URL": x.start(),
+        "ELEVATIQ_API_KEYS_GEMINI_API_KEY": "benchmark",
+        "ELEVATIQ_X_API_BEARER_TOKEN": "benchmark",
+        "ELEVATIQ_CACHE_URL": f"sqlite:///{os.path.join(workdir, 'cache.db')}",
+        # apptest sessions also record funnel events and resume checkpoints; keep them out of the real databases
+        "ELEVATIQ_ANALYTICS_URL": f"sqlite:///{os.path.join(workdir, 'analytics.db')}",
+        "ELEVATIQ_CHECKPOINT_URL": f"sqlite:///{os.path.join(workdir, 'sessions.db')}",
+        "ELEVATIQ_GEMINI_BACKOFF_BASE": "0.05",
+        # The link stand-in listens on loopback, which the link checker refuses unless allowed
+        "ELEVATIQ_LINKS_ALLOWED_HOSTS": "127.0.0.1",
+    })
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    # Loaded up front so import cost is not charged to the first sessions
+    importlib.import_module("pipeline")
+    importlib.import_module("pdf_render")
+    from metrics import metrics
+
+    run_session = partial(headless_session if args.mode == "headless" else apptest_session, sentences=args.answer_sentences)
+    if args.mode == "apptest" and args.concurrency > 1:
+        # AppTest instances share process-wide Streamlit state and interfere when driven from several threads
+        print("apptest mode drives one session at a time; use headless mode for concurrent load")
+        args.concurrency = 1
+    timings = Timings()
+    failures = []
+    sessions = []
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if args.tracemalloc:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    def run(index: int):
+        profession = PROFESSIONS[index % max(1, min(args.professions, len(PROFESSIONS)))]
+        if args.spellings:
+            variants = SPELLINGS[profession]
+            profession = variants[index // len(PROFESSIONS) % len(variants)]
+        start = time.perf_counter()
+        try:
+            sessions.append(run_session(index, profession, timings))
+        except Exception as e:
+            failures.append(f"session {index}: {e!r}")
+        finally:
+            with timings._lock:
+                timings.samples["session"].append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(run, range(args.sessions)))
+    wall = time.perf_counter() - started
+    gc.collect()
+    # ru_maxrss is in KB on Linux; sessions are kept alive until here, like open browser tabs
+    rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    retained_kb = rss_growth_kb
+    if args.tracemalloc:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        retained_kb = max(0, current - baseline) / 1024
+
+    print(f"{args.sessions} {args.mode} sessions, concurrency {args.concurrency}, upstream latency {args.latency * 1000:.0f} ms, error rate {args.error_rate:.0%}")
+    print(f"{'step':<16}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    report = {}
+    for name in STEPS + ("session",):
+        samples = timings.samples.get(name)
+        if not samples:
+            continue
+        report[name] = {"n": len(samples), "p50_ms": statistics.median(samples) * 1000,
+                        "p95_ms": percentile(samples, 0.95) * 1000, "max_ms": max(samples) * 1000}
+        row = report[name]
+        print(f"{name:<16}{row['n']:>5}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['max_ms']:>10.1f}")
+
+    per_session = max(1, args.sessions)
+    totals = {
+        "wall_seconds": wall,
+        "sessions_per_second": args.sessions / wall if wall else 0.0,
+        "gemini_requests_per_session": gemini.requests / per_session,
+        "x_requests_per_session": x.requests / per_session,
+        "link_requests_per_session": links.requests / per_session,
+        "injected_errors": gemini.errors + x.errors,
+        "memory_kb_per_session": retained_kb / per_session,
+        "memory_source": "tracemalloc" if args.tracemalloc else "max_rss_growth",
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "failures": len(failures),
+    }
+    summary = metrics.summary()
+    hit_rates = {f"{row['metric']}{row['labels']}": row["hit_rate"] for row in summary["hit_rates"]}
+    prompt_tokens = {row["labels"]: {"p50": row["p50"], "p95": row["p95"], "max": row["max"]}
+                     for row in summary["latencies"] if row["metric"] == "elevatiq_gemini_prompt_tokens"}
+    print(f"throughput        {totals['sessions_per_second']:.2f} sessions/s over {wall:.1f} s")
+    print(f"upstream          {totals['gemini_requests_per_session']:.2f} Gemini, {totals['x_requests_per_session']:.2f} X and {totals['link_requests_per_session']:.2f} link requests per session ({totals['injected_errors']} injected errors)")
+    print(f"memory            {totals['memory_kb_per_session']:.0f} KB per session ({totals['memory_source']}), {totals['max_rss_mb']:.0f} MB max RSS")
+    for stage, sizes in sorted(prompt_tokens.items()):
+        print(f"prompt tokens     {stage}: p50 {sizes['p50']:.0f}, p95 {sizes['p95']:.0f}, max {sizes['max']:.0f} (estimated)")
+    for name, rate in sorted(hit_rates.items()):
+        print(f"hit rate          {name}: {rate:.0%}")
+    for failure in failures[:10]:
+        print(f"FAILED            {failure}")
+    gemini.stop()
+    x.stop()
+    links.stop()
+
+    if args.json:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        with open(args.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.time(), "revision": revision, "args": vars(args), "steps": report, "totals": totals, "hit_rates": hit_rates, "prompt_tokens": prompt_tokens}) + "\n")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Rerun cost of the heaviest steps: python benchmarks/render.py [--skills 12] [--items 8] [--runs 20]
+# Sessions are seeded with a stored learning path, so no Gemini or X calls are made. Each step is measured
+# with batched rendering on and off (ELEVATIQ_UI_BATCH_RENDERING) in a fresh interpreter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def count_elements(node) -> int:
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(child) for child in children.values())
+
+
+def seeded_session(at, step: str, skills: int, items: int):
+    from learning_path import PHASES, learning_path_fingerprint
+
+    ratings = {f"Skill {i}": (i % 10) + 1 for i in range(skills)}
+    state = at.session_state
+    state.form_submitted = True
+    state.name, state.email, state.profession = "Bench", "bench@example.com", "Data Scientist"
+    state.suggested_skills = list(ratings)
+    state.selected_skills = dict(ratings)
+    state.verification_questions, state.verification_answers, state.verification_scores = {}, {}, {}
+    state.skills_verified = False
+    state.language = "English"
+    state.trending_skills = ["Python"]
+    state.prerequisites = {}
+    state.learning_path = None
+    state.prefetch = {}
+    state.splash_done = True
+    if step == "recommendations":
+        state.verification_questions = {skill: {"question": "?", "hint": "-"} for skill in ratings}
+        state.verification_answers = {skill: "answer" for skill in ratings}
+        state.verification_scores = {skill: 5 for skill in ratings}
+        state.skills_verified = True
+        path = {phase: {
+            "header": f"Phase: {phase} - 4 weeks",
+            "focus": f"{phase} focus",
+            "items": [{"skill": f"Skill {i}", "type": "Course", "name": f"Resource {i}", "url": "https://example.com", "rationale": "Because"} for i in range(items)],
+        } for phase in PHASES}
+        inputs = (state.profession, state.selected_skills, state.verification_answers, state.verification_scores, state.prerequisites, state.trending_skills)
+        state.learning_path = {"fingerprint": learning_path_fingerprint(*inputs), "path": path}
+
+
+def measure(step: str, skills: int, items: int, runs: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.secrets["api_keys"] = {"gemini_api_key": "benchmark"}
+    seeded_session(at, step, skills, items)
+    at.run()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    return {"elements": count_elements(at.main), "rerun_ms": statistics.median(timings) * 1000, "exceptions": len(at.exception)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure element count and rerun time with and without batched rendering.")
+    parser.add_argument("--skills", type=int, default=12)
+    parser.add_argument("--items", type=int, default=8, help="recommendations per phase")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--worker", nargs=2, metavar=("STEP", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    os.chdir(ROOT)
+
+    if args.worker:
+        step, mode = args.worker
+        os.environ["ELEVATIQ_UI_BATCH_RENDERING"] = mode
+        result = measure(step, args.skills, args.items, args.runs)
+        print(f"{result['elements']} {result['rerun_ms']:.1f} {result['exceptions']}")
+        return
+
+    import subprocess
+    for step in ("rate", "recommendations"):
+        for mode in ("false", "true"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--skills", str(args.skills), "--items", str(args.items), "--runs", str(args.runs), "--worker", step, mode],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            elements, rerun_ms, exceptions = output[-3:]
+            print(f"{step:<16} batched={mode:<5} elements={elements:>4}  rerun={rerun_ms:>6} ms  exceptions={exceptions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Cold-start benchmark: python benchmarks/startup.py [--runs 5] [--json results.jsonl]
+# Every sample runs in a fresh interpreter, so module imports and first-render work are paid in full each time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["tweepy", "reportlab", "sqlalchemy"]
+
+IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+RENDER_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60)
+at.secrets["api_keys"] = {{"gemini_api_key": "benchmark"}}
+at.secrets["x_api"] = {{"bearer_token": "benchmark"}}
+ready = time.perf_counter()
+at.run()
+first = time.perf_counter()
+at.run()
+rerun = time.perf_counter()
+print(json.dumps({{
+    "seconds": first - start, "first_render": first - ready, "rerun": rerun - first,
+    "exceptions": len(at.exception), "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_sample(snippet: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(name: str, snippet: str, runs: int) -> dict:
+    samples = [run_sample(snippet) for _ in range(runs)]
+    summary = {"name": name, "median_seconds": statistics.median(s["seconds"] for s in samples), "loaded": samples[-1]["loaded"]}
+    for key in ("first_render", "rerun", "exceptions"):
+        if key in samples[0]:
+            summary[key] = statistics.median(s[key] for s in samples)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure ElevatIQ import and first-render cost.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--json", help="append the results as one JSON line to this file")
+    args = parser.parse_args(argv)
+
+    results = [
+        measure(f"import {module}", IMPORT_SNIPPET.format(module=module, heavy=HEAVY_MODULES), args.runs)
+        for module in ("streamlit", "pipeline", "pdf_export", "api")
+    ]
+    results.append(measure("app first render", RENDER_SNIPPET.format(app=os.path.join(ROOT, "app.py"), heavy=HEAVY_MODULES), args.runs))
+
+    for result in results:
+        extra = ""
+        if "first_render" in result:
+            extra = f"  (script {result['first_render'] * 1000:.0f} ms, rerun {result['rerun'] * 1000:.0f} ms, exceptions {result['exceptions']:.0f})"
+        print(f"{result['name']:<20} {result['median_seconds'] * 1000:8.0f} ms  heavy loaded: {', '.join(result['loaded']) or '-'}{extra}")
+
+    if args.json:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        with open(args.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.time(), "revision": revision, "runs": args.runs, "results": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
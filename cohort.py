@@ -0,0 +1,202 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from llm_cache import is_error_response
+from pdf_export import get_pdf_exporter
+from pipeline import (
+    fetch_suggested_skills, fetch_trending_skills, get_learning_path,
+    get_verification_questions_and_prerequisites, score_verification_answers,
+)
+from professions import resolve_profession
+from structured_output import StructuredOutputError
+
+# Headless cohort runner: python cohort.py roster.csv --out reports/ [--workers 8] [--checkpoint path]
+# Roster rows need name and profession; email/id, ratings ({"Skill": 1-10}) and answers ({"Skill": "text"})
+# are optional. In CSV, ratings and answers are JSON objects; ratings may also be "Skill=7;Other=4".
+# A row that can't be read is recorded as a failed learner; the rest of the roster still runs.
+
+
+class RosterError(ValueError):
+    pass
+
+
+def parse_mapping(value, numeric: bool = False) -> dict:
+    if isinstance(value, dict):
+        mapping = value
+    elif not value or not str(value).strip():
+        return {}
+    else:
+        try:
+            mapping = json.loads(value)
+        except ValueError:
+            pairs = [re.split(r"[=:]", pair, maxsplit=1) for pair in str(value).split(";") if pair.strip()]
+            if not all(len(pair) == 2 for pair in pairs):
+                raise RosterError(f"{value!r} is neither a JSON object nor Skill=value pairs")
+            mapping = dict(pairs)
+    if not isinstance(mapping, dict):
+        raise RosterError(f"{value!r} is not a JSON object")
+    mapping = {str(k).strip(): v for k, v in mapping.items()}
+    if numeric:
+        try:
+            return {k: max(1, min(10, int(v))) for k, v in mapping.items()}
+        except (TypeError, ValueError):
+            raise RosterError(f"ratings in {value!r} must be numbers")
+    return {k: str(v).strip() for k, v in mapping.items()}
+
+
+def content_id(content: str) -> str:
+    # Rows without an id or email are keyed by what they contain, so editing other rows doesn't shift them
+    return "row-" + hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+
+
+def parse_learner(row) -> dict:
+    # A bad row becomes a learner carrying an error, so it fails on its own instead of stopping the run
+    if not isinstance(row, dict):
+        return {"id": content_id(json.dumps(row)), "error": "row is not an object"}
+    row = {str(k): v for k, v in row.items()}
+    learner_id = str(row.get("id") or row.get("email") or "").strip() or content_id(json.dumps(row, sort_keys=True, default=str))
+    missing = [key for key in ("name", "profession") if not isinstance(row.get(key), str) or not row[key].strip()]
+    if missing:
+        return {"id": learner_id, "error": f"missing {' and '.join(missing)}"}
+    try:
+        return {
+            "id": learner_id,
+            "name": row["name"].strip(),
+            "profession": row["profession"].strip(),
+            "ratings": parse_mapping(row.get("ratings"), numeric=True),
+            "answers": parse_mapping(row.get("answers")),
+        }
+    except RosterError as e:
+        return {"id": learner_id, "error": str(e)}
+
+
+def load_roster(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        if not path.endswith(".jsonl"):
+            return [parse_learner(row) for row in csv.DictReader(f)]
+        learners = []
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                learners.append({"id": content_id(line.strip()), "error": f"invalid JSON: {e}"})
+                continue
+            learners.append(parse_learner(row))
+        return learners
+
+
+class Checkpoint:
+    # Append-only JSONL of finished learners; a resumed run skips every id already marked done.
+    # Stages of a half-finished learner are not repeated either, since their Gemini answers sit in the response cache
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("status") == "done":
+                        self.done.add(record["id"])
+
+    def record(self, record: dict):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if record["status"] == "done":
+                self.done.add(record["id"])
+
+
+def suggested_ratings(profession: str, session_id: str) -> dict:
+    # A failed suggestion call must fail the learner, so the checkpoint retries them on the next run
+    skills = fetch_suggested_skills(profession, session_id)
+    if not skills or is_error_response(skills[0]):
+        raise StructuredOutputError(skills[0] if skills else "Error: No skills were suggested.")
+    return {skill: 5 for skill in skills[:5]}
+
+
+def process_learner(learner: dict, out_dir: str) -> dict:
+    session_id = f"cohort:{learner['id']}"
+    # Profession-keyed prompts are shared by every learner in that profession (and with the UI and API)
+    # through the response cache and single-flight coalescing, so a cohort pays for each one once
+    profession = resolve_profession(learner["profession"])
+    ratings = learner["ratings"] or suggested_ratings(profession, session_id)
+    questions, prerequisites = get_verification_questions_and_prerequisites(profession, ratings, session_id)
+    answers = {skill: learner["answers"].get(skill, "") for skill in ratings}
+    scores, errors = ({}, [])
+    if any(answers.values()):
+        scores, errors = score_verification_answers(profession, questions, answers, session_id)
+    try:
+        trending_skills = fetch_trending_skills(profession)
+    except Exception:
+        trending_skills = ["Error fetching trends"]
+    learning_path = get_learning_path(profession, ratings, answers, scores, prerequisites, trending_skills, session_id)
+
+    _, future = get_pdf_exporter().submit(learner["name"], profession, ratings, scores, learning_path, trending_skills)
+    pdf_path = os.path.join(out_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", learner["id"]) + ".pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(future.result())
+    return {"id": learner["id"], "status": "done", "pdf": pdf_path, "scores": scores, "errors": errors}
+
+
+def run_cohort(roster_path: str, out_dir: str, checkpoint_path: str, workers: int) -> dict:
+    os.makedirs(out_dir, exist_ok=True)
+    checkpoint = Checkpoint(checkpoint_path)
+    roster = load_roster(roster_path)
+    learners = [learner for learner in roster if learner["id"] not in checkpoint.done]
+    summary = {"skipped": len({learner["id"] for learner in roster} & checkpoint.done), "done": 0, "failed": 0}
+    print(f"{len(learners)} learners to process, {summary['skipped']} already done")
+
+    def finish(learner: dict, record: dict):
+        checkpoint.record(record)
+        summary[record["status"]] += 1
+        suffix = f" ({record['error']})" if record["status"] == "failed" else ""
+        print(f"[{summary['done'] + summary['failed']}/{len(learners)}] {learner['id']}: {record['status']}{suffix}")
+
+    for learner in learners:
+        if "error" in learner:
+            finish(learner, {"id": learner["id"], "status": "failed", "error": learner["error"]})
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="elevatiq-cohort")
+    try:
+        futures = {executor.submit(process_learner, learner, out_dir): learner for learner in learners if "error" not in learner}
+        for future in as_completed(futures):
+            learner = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {"id": learner["id"], "status": "failed", "error": str(e)}
+            finish(learner, record)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume from the checkpoint")
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate ElevatIQ learning paths for a whole roster.")
+    parser.add_argument("roster", help="CSV or JSONL roster file")
+    parser.add_argument("--out", default="cohort_reports", help="directory for the generated PDFs")
+    parser.add_argument("--workers", type=int, default=8, help="learners processed concurrently")
+    parser.add_argument("--checkpoint", help="JSONL checkpoint file (default: <out>/checkpoint.jsonl)")
+    args = parser.parse_args(argv)
+    summary = run_cohort(args.roster, args.out, args.checkpoint or os.path.join(args.out, "checkpoint.jsonl"), args.workers)
+    print(f"Done: {summary['done']} generated, {summary['failed']} failed, {summary['skipped']} skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from config import get_setting
+
+
+class LimiterTimeout(Exception):
+    pass
+
+
+class SingleFlight:
+    # Coalesces concurrent calls with the same key: the first caller runs fn, everyone else waits for its result
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            if not future.done():
+                # KeyboardInterrupt, SystemExit or a thread being torn down: release the followers, then let it propagate
+                future.set_exception(RuntimeError(f"The call for {key!r} was interrupted"))
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class FairLimiter:
+    # Caps concurrent upstream calls process-wide. Waiters queue per session and freed slots are
+    # handed out round-robin across sessions, so one busy session can't starve the others
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._queues = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, session_id: str, timeout: float = None) -> bool:
+        with self._lock:
+            if self.active < self.limit and not self._queues:
+                self.active += 1
+                return True
+            granted = threading.Event()
+            self._queues.setdefault(session_id, deque()).append(granted)
+        if granted.wait(timeout):
+            return True
+        with self._lock:
+            if granted.is_set():
+                return True
+            queue = self._queues.get(session_id)
+            queue.remove(granted)
+            if not queue:
+                del self._queues[session_id]
+            return False
+
+    def release(self):
+        with self._lock:
+            if not self._queues:
+                self.active -= 1
+                return
+            # The slot passes straight to the next session in line; that session moves to the back
+            session_id, queue = self._queues.popitem(last=False)
+            granted = queue.popleft()
+            if queue:
+                self._queues[session_id] = queue
+            granted.set()
+
+    @contextmanager
+    def slot(self, session_id: str, timeout: float = None):
+        if not self.acquire(session_id, timeout):
+            raise LimiterTimeout(f"No upstream slot free after {timeout}s")
+        try:
+            yield
+        finally:
+            self.release()
+
+    def waiting(self) -> int:
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+
+gemini_flight = SingleFlight()
+gemini_limiter = FairLimiter(get_setting("gemini", "max_concurrency", 8))
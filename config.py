@@ -0,0 +1,18 @@
+import os
+
+import streamlit as st
+
+
+def get_setting(section: str, key: str, default=None):
+    # Environment variables (ELEVATIQ_<SECTION>_<KEY>) win over .streamlit/secrets.toml
+    env_value = os.environ.get(f"ELEVATIQ_{section}_{key}".upper())
+    if env_value is not None:
+        if isinstance(default, bool):
+            return env_value.strip().lower() in ("1", "true", "yes", "on")
+        if default is not None:
+            return type(default)(env_value)
+        return env_value
+    try:
+        return st.secrets[section][key]
+    except Exception:
+        return default
@@ -0,0 +1,18 @@
+from sqlalchemy import create_engine, event
+
+# Engine setup shared by every SQLAlchemy-backed store (response cache, checkpoints, analytics, link checks)
+
+
+def make_engine(url: str):
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+        # WAL lets several app processes read while one writes
+        event.listen(engine, "connect", _enable_wal)
+        return engine
+    return create_engine(url, pool_pre_ping=True)
+
+
+def _enable_wal(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
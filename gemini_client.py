@@ -0,0 +1,226 @@
+import json
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import get_setting
+from metrics import metrics
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GeminiError(Exception):
+    pass
+
+
+class CircuitOpenError(GeminiError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probe_owner = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            # Half-open lets exactly one probe through; everyone else fails fast
+            if state == "half-open" and self._probe_owner is None:
+                self._probe_owner = threading.get_ident()
+                return True
+            return False
+
+    def release_probe(self):
+        # A probe that ends without a verdict (an unexpected exception) must not keep half-open shut for good
+        with self._lock:
+            if self._probe_owner == threading.get_ident():
+                self._probe_owner = None
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probe_owner = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_owner = None
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class GeminiClient:
+    def __init__(self, api_key: str, model: str = "gemini-2.0-flash", base_url: str = GEMINI_BASE_URL, connect_timeout: float = 3.05,
+                 read_timeout: float = 60.0, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 8.0, pool_size: int = 20, breaker: CircuitBreaker = None):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        # One pooled session per process: keep-alive and TLS reuse across all Streamlit sessions
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json", "x-goog-api-key": api_key})
+
+    def url(self, method: str = "generateContent") -> str:
+        return f"{self.base_url}/{self.model}:{method}"
+
+    def _backoff(self, attempt: int, retry_after=None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def post(self, method: str, body: dict, timeout=None, **kwargs) -> requests.Response:
+        if not self.breaker.allow():
+            metrics.inc("elevatiq_gemini_breaker_rejections_total")
+            raise CircuitOpenError("Gemini is temporarily unavailable")
+        try:
+            return self._post(method, body, timeout, **kwargs)
+        finally:
+            self.breaker.release_probe()
+
+    def _post(self, method: str, body: dict, timeout=None, **kwargs) -> requests.Response:
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            reason = "connection"
+            try:
+                with metrics.timer("elevatiq_gemini_http_seconds", method=method):
+                    response = self.session.post(self.url(method), json=body, timeout=timeout or self.timeout, **kwargs)
+            except requests.RequestException as e:
+                last_error = GeminiError(f"Request failed: {e}")
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    return response
+                last_error = GeminiError(f"Received status code {response.status_code}")
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    # Client errors are our fault, not an upstream brownout
+                    self.breaker.record_success()
+                    raise last_error
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                reason = str(response.status_code)
+                response.close()
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff(attempt, retry_after)
+            if delay > self.backoff_max * 2:
+                # Upstream asked us to wait longer than a user will; fail now instead of holding the thread
+                break
+            metrics.inc("elevatiq_gemini_retries_total", method=method, reason=reason)
+            time.sleep(delay)
+        metrics.inc("elevatiq_gemini_failures_total", method=method)
+        self.breaker.record_failure()
+        raise last_error
+
+    def _record_usage(self, usage: dict):
+        if usage:
+            metrics.inc("elevatiq_gemini_tokens_total", usage.get("promptTokenCount", 0), model=self.model, kind="prompt")
+            metrics.inc("elevatiq_gemini_tokens_total", usage.get("candidatesTokenCount", 0), model=self.model, kind="response")
+
+    def generate(self, prompt: str, timeout=None, response_schema: dict = None) -> str:
+        body = {"contents": [{"parts": [{"text": prompt}]}]}
+        if response_schema is not None:
+            body["generationConfig"] = {"responseMimeType": "application/json", "responseSchema": response_schema}
+        response = self.post("generateContent", body, timeout=timeout)
+        try:
+            payload = response.json()
+            text = payload["candidates"][0]["content"]["parts"][0]["text"].strip()
+        except (ValueError, KeyError, IndexError) as e:
+            raise GeminiError(f"Unexpected response format: {e}")
+        self._record_usage(payload.get("usageMetadata"))
+        return text
+
+    def stream(self, prompt: str, timeout=None):
+        body = {"contents": [{"parts": [{"text": prompt}]}]}
+        response = self.post("streamGenerateContent", body, timeout=timeout, stream=True, params={"alt": "sse"})
+        response.encoding = "utf-8"
+        usage = None
+        with response:
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    payload = json.loads(line[len("data:"):])
+                    # Usage is cumulative across chunks; the last one seen carries the totals
+                    usage = payload.get("usageMetadata", usage)
+                    for candidate in payload.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            if part.get("text"):
+                                yield part["text"]
+            except requests.RequestException as e:
+                raise GeminiError(f"Stream interrupted: {e}")
+            except ValueError as e:
+                raise GeminiError(f"Unexpected response format: {e}")
+        self._record_usage(usage)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GeminiClient(
+                get_setting("api_keys", "gemini_api_key"),
+                model=get_setting("gemini", "model", "gemini-2.0-flash"),
+                base_url=get_setting("gemini", "base_url", GEMINI_BASE_URL),
+                connect_timeout=get_setting("gemini", "connect_timeout", 3.05),
+                read_timeout=get_setting("gemini", "read_timeout", 60.0),
+                max_retries=get_setting("gemini", "max_retries", 3),
+                backoff_base=get_setting("gemini", "backoff_base", 0.5),
+                backoff_max=get_setting("gemini", "backoff_max", 8.0),
+                pool_size=get_setting("gemini", "pool_size", 20),
+                breaker=CircuitBreaker(
+                    get_setting("gemini", "breaker_failures", 5),
+                    get_setting("gemini", "breaker_reset_seconds", 30.0),
+                ),
+            )
+        return _client
@@ -0,0 +1,110 @@
+import hashlib
+import json
+
+PHASES = ("Beginner", "Intermediate", "Advanced")
+NO_URL_VALUES = {"", "n/a", "na", "none", "not available"}
+
+
+def empty_learning_path() -> dict:
+    return {phase: {"header": None, "focus": None, "items": []} for phase in PHASES}
+
+
+def parse_line(line: str):
+    line = line.strip().lstrip("-*•").strip()
+    if not line:
+        return None
+    if "|" not in line:
+        if line.lower().startswith("focus:"):
+            return "focus", line.split(":", 1)[1].strip()
+        phase = next((p for p in PHASES if p.lower() in line.lower()), None)
+        if phase:
+            return "phase", {"phase": phase, "header": line}
+        return None
+    if ": " not in line:
+        return "malformed", line
+    skill, details = line.split(": ", 1)
+    parts = [d.strip() for d in details.split("|")]
+    if len(parts) < 3:
+        return "malformed", line
+    url = parts[2].strip("<>")
+    return "item", {
+        "skill": skill.strip("* "),
+        "type": parts[0],
+        "name": parts[1],
+        "url": url if url.lower() not in NO_URL_VALUES else "N/A",
+        "rationale": parts[3] if len(parts) > 3 and parts[3] else "No rationale provided",
+    }
+
+
+class LearningPathParser:
+    # Accepts text in arbitrary chunks (e.g. from streamGenerateContent) and emits
+    # (phase, kind, payload) events as soon as each line is complete
+    def __init__(self):
+        self.path = empty_learning_path()
+        self.current_phase = None
+        self._pending = ""
+
+    def feed(self, chunk: str) -> list:
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        return [event for event in map(self._consume, lines) if event]
+
+    def close(self) -> list:
+        line, self._pending = self._pending, ""
+        event = self._consume(line)
+        return [event] if event else []
+
+    def _consume(self, line: str):
+        parsed = parse_line(line)
+        if parsed is None:
+            return None
+        kind, payload = parsed
+        if kind == "phase":
+            self.current_phase = payload["phase"]
+            self.path[self.current_phase]["header"] = payload["header"]
+            return self.current_phase, kind, payload["header"]
+        if self.current_phase is None:
+            return None
+        phase = self.path[self.current_phase]
+        if kind == "focus":
+            phase["focus"] = payload
+        elif kind == "item":
+            phase["items"].append(payload)
+        return self.current_phase, kind, payload
+
+
+def parse_learning_path(text: str) -> dict:
+    parser = LearningPathParser()
+    parser.feed(text)
+    parser.close()
+    return parser.path
+
+
+def learning_path_events(path: dict):
+    # Replays a complete learning path as the same events LearningPathParser emits while streaming
+    for phase in PHASES:
+        if path[phase]["header"] is None:
+            continue
+        yield phase, "phase", path[phase]["header"]
+        if path[phase]["focus"]:
+            yield phase, "focus", path[phase]["focus"]
+        for item in path[phase]["items"]:
+            yield phase, "item", item
+
+
+def format_learning_path(path: dict) -> str:
+    lines = []
+    for phase, kind, payload in learning_path_events(path):
+        if kind == "phase":
+            lines.append(f"- {payload}")
+        elif kind == "focus":
+            lines.append(f"  - Focus: {payload}")
+        else:
+            lines.append(f"  - {payload['skill']}: {payload['type']} | {payload['name']} | {payload['url']} | {payload['rationale']}")
+    return "\n".join(lines)
+
+
+def learning_path_fingerprint(*inputs) -> str:
+    # Identifies the recommendation inputs so reruns can reuse the parsed path instead of asking Gemini again
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,233 @@
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import get_setting
+from metrics import metrics
+
+# Resource URLs from Gemini are checked concurrently with pooled HEAD requests, and the verdicts are cached
+# by URL in a shared store, so a popular resource is checked about once a day rather than once per user
+
+OK = "ok"
+DEAD = "dead"
+UNVERIFIED = "unverified"
+# Only these prove a page is gone; 401/403/429/5xx and timeouts often mean the site refuses bots or is busy
+DEAD_STATUSES = {404, 410}
+HEAD_REFUSED_STATUSES = {403, 405, 501}
+MAX_REDIRECTS = 5
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str):
+    url = url.strip().rstrip(".,;")
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname or " " in url:
+        return None
+    return url
+
+
+def is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def parse_hosts(hosts) -> set:
+    if isinstance(hosts, str):
+        hosts = hosts.split(",")
+    return {host.strip().casefold() for host in hosts if host.strip()}
+
+
+class BlockedAddressError(requests.exceptions.ConnectionError):
+    pass
+
+
+class PinnedAddressAdapter(HTTPAdapter):
+    # Resolves and vets the host once, then dials that exact address, so a name that re-resolves between
+    # the check and the connect (DNS rebinding) cannot reach a private one. The Host header, SNI and
+    # certificate check still use the original name
+    def __init__(self, allowed_hosts: set = frozenset(), **kwargs):
+        self.allowed_hosts = allowed_hosts
+        super().__init__(**kwargs)
+
+    def resolve(self, hostname: str, port: int) -> str:
+        try:
+            addresses = [info[4][0] for info in socket.getaddrinfo(hostname, port, proto=socket.IPPROTO_TCP)]
+        except (socket.gaierror, UnicodeError) as e:
+            raise requests.exceptions.ConnectionError(f"Cannot resolve {hostname}: {e}")
+        if not addresses:
+            raise requests.exceptions.ConnectionError(f"Cannot resolve {hostname}")
+        if hostname.casefold() not in self.allowed_hosts and not all(is_public_address(address) for address in addresses):
+            raise BlockedAddressError(f"{hostname} resolves to a non-public address")
+        return addresses[0]
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        hostname = host_params["host"]
+        host_params["host"] = self.resolve(hostname, host_params["port"] or DEFAULT_PORTS[host_params["scheme"]])
+        if host_params["scheme"] == "https":
+            pool_kwargs["server_hostname"] = hostname
+            pool_kwargs["assert_hostname"] = hostname
+        return host_params, pool_kwargs
+
+    def add_headers(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        host = f"[{parts.hostname}]" if ":" in parts.hostname else parts.hostname
+        request.headers["Host"] = f"{host}:{parts.port}" if parts.port else host
+
+
+class LinkChecker:
+    # URLs come from Gemini output that users can steer through their answers, so every hop (including
+    # redirects) must connect only to public addresses; allowed_hosts opts specific hosts back in, e.g. a
+    # local stand-in for benchmarks
+    def __init__(self, store, timeout: float, max_workers: int, ttl_seconds: dict, allowed_hosts: set = frozenset()):
+        self.store = store
+        self.timeout = timeout
+        self.ttl_seconds = ttl_seconds
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="elevatiq-links")
+        self.session = requests.Session()
+        # Proxies from the environment would resolve the name again on our behalf
+        self.session.trust_env = False
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (compatible; ElevatIQ link checker)"
+        adapter = PinnedAddressAdapter(allowed_hosts, pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, url: str) -> Future:
+        # Every session asking about the same URL at once shares one check
+        normalized = normalize_url(url)
+        if normalized is None:
+            future = Future()
+            future.set_result((None, DEAD))
+            return future
+        with self._lock:
+            future = self.pending.get(normalized)
+            if future is not None:
+                return future
+            future = self.pending[normalized] = self.executor.submit(self._check, normalized)
+        future.add_done_callback(lambda done: self._release(normalized, done))
+        return future
+
+    def _release(self, url: str, future: Future):
+        with self._lock:
+            if self.pending.get(url) is future:
+                del self.pending[url]
+
+    def _check(self, url: str) -> tuple:
+        status = self.store.get(url)
+        if status is not None:
+            metrics.inc("elevatiq_link_cache_total", result="hit")
+            return url, status
+        metrics.inc("elevatiq_link_cache_total", result="miss")
+        with metrics.timer("elevatiq_link_check_seconds"):
+            status = self._probe(url)
+        metrics.inc("elevatiq_link_checks_total", status=status)
+        self.store.put(url, status, self.ttl_seconds[status])
+        return url, status
+
+    def _probe(self, url: str) -> str:
+        # Redirects are followed by hand so each target is vetted before anything is sent to it
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                response = self.session.head(url, timeout=self.timeout, allow_redirects=False)
+                if response.status_code in HEAD_REFUSED_STATUSES:
+                    response = self.session.get(url, timeout=self.timeout, allow_redirects=False, stream=True)
+                    response.close()
+                if not response.is_redirect:
+                    break
+                url = urljoin(url, response.headers["location"])
+            else:
+                return DEAD
+        except BlockedAddressError:
+            metrics.inc("elevatiq_link_blocked_total")
+            return DEAD
+        except requests.exceptions.Timeout:
+            return UNVERIFIED
+        except requests.exceptions.RequestException:
+            # Refused connections, unsupported schemes and malformed responses
+            return DEAD
+        if response.status_code < 400:
+            return OK
+        return DEAD if response.status_code in DEAD_STATUSES else UNVERIFIED
+
+    def check_all(self, urls: list, timeout: float) -> dict:
+        # Checks still running at the deadline are left out and picked up from the store on a later call
+        futures = {url: self.submit(url) for url in set(urls)}
+        wait(futures.values(), timeout=timeout)
+        return {url: future.result() for url, future in futures.items() if future.done() and future.exception() is None}
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def get_link_checker() -> LinkChecker:
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            # SQLAlchemy is imported with the first link check, not when the app starts
+            from link_store import LinkStore
+            _checker = LinkChecker(
+                LinkStore(get_setting("links", "url", get_setting("cache", "url", "sqlite:///elevatiq_cache.db"))),
+                timeout=get_setting("links", "timeout_seconds", 3.0),
+                max_workers=get_setting("links", "max_workers", 16),
+                ttl_seconds={
+                    OK: get_setting("links", "ttl_seconds", 24 * 3600),
+                    DEAD: get_setting("links", "dead_ttl_seconds", 6 * 3600),
+                    UNVERIFIED: get_setting("links", "retry_seconds", 15 * 60),
+                },
+                allowed_hosts=parse_hosts(get_setting("links", "allowed_hosts", "")),
+            )
+            metrics.register_gauge("elevatiq_link_checks_in_flight", lambda: len(_checker.pending))
+        return _checker
+
+
+def links_enabled() -> bool:
+    return get_setting("links", "enabled", True)
+
+
+def prefetch_links(events):
+    # Starts checking each item's URL as it streams in, so the checks overlap the rest of the response
+    for event in events:
+        if links_enabled() and event[1] == "item" and event[2]["url"] != "N/A":
+            get_link_checker().submit(event[2]["url"])
+        yield event
+
+
+def validate_learning_path(path: dict, timeout: float = None) -> list:
+    # Sets link_status on every item not yet checked and returns those items. Dead links are kept and
+    # marked, or dropped with links.dead_links = "drop"; working URLs are stored in normalized form
+    if not links_enabled():
+        return []
+    items = [item for phase in path.values() for item in phase["items"] if item["url"] != "N/A" and "link_status" not in item]
+    if not items:
+        return []
+    started = time.perf_counter()
+    verdicts = get_link_checker().check_all(
+        [item["url"] for item in items], timeout if timeout is not None else get_setting("links", "wait_seconds", 5.0)
+    )
+    metrics.observe("elevatiq_link_validation_seconds", time.perf_counter() - started)
+    drop = get_setting("links", "dead_links", "mark") == "drop"
+    checked = []
+    for item in items:
+        if item["url"] not in verdicts:
+            continue
+        normalized, status = verdicts[item["url"]]
+        item["link_status"] = status
+        if status == DEAD and drop:
+            item["url"] = "N/A"
+        elif normalized:
+            item["url"] = normalized
+        checked.append(item)
+    return checked
@@ -0,0 +1,49 @@
+import hashlib
+import time
+
+from sqlalchemy import Column, Float, String, Text, delete
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from db import make_engine
+
+Base = declarative_base()
+
+
+class LinkCheck(Base):
+    __tablename__ = "link_checks"
+
+    key = Column(String(64), primary_key=True)
+    url = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False)
+    checked_at = Column(Float, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class LinkStore:
+    def __init__(self, url: str):
+        self.engine = make_engine(url)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def get(self, url: str):
+        with self.Session() as session:
+            check = session.get(LinkCheck, url_key(url))
+            if check is None or check.expires_at < time.time():
+                return None
+            return check.status
+
+    def put(self, url: str, status: str, ttl_seconds: float):
+        now = time.time()
+        with self.Session() as session:
+            session.merge(LinkCheck(key=url_key(url), url=url, status=status, checked_at=now, expires_at=now + ttl_seconds))
+            session.execute(delete(LinkCheck).where(LinkCheck.expires_at < now))
+            session.commit()
+
+    def clear(self):
+        with self.Session() as session:
+            session.execute(delete(LinkCheck))
+            session.commit()
@@ -0,0 +1,35 @@
+import hashlib
+import re
+import threading
+
+from config import get_setting
+
+
+def normalize_prompt(prompt: str) -> str:
+    return re.sub(r"\s+", " ", prompt).strip().casefold()
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+def is_error_response(response) -> bool:
+    return not response or not response.strip() or response.startswith("Error:")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            # SQLAlchemy is imported with the first cache lookup, not when the app starts
+            from response_store import ResponseCache
+            _cache = ResponseCache(
+                get_setting("cache", "url", "sqlite:///elevatiq_cache.db"),
+                get_setting("cache", "ttl_seconds", 7 * 24 * 3600),
+                get_setting("cache", "max_entries", 5000),
+            )
+        return _cache
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import get_setting
+from metrics import metrics
+
+
+def export_to_pdf(name: str, profession: str, skills: dict, verification_scores: dict, learning_path: dict, trending_skills: list) -> bytes:
+    # ReportLab is imported on the first export, not when the app or API starts
+    from pdf_render import render_pdf
+    with metrics.timer("elevatiq_pdf_build_seconds"):
+        return render_pdf(name, profession, skills, verification_scores, learning_path, trending_skills)
+
+
+def pdf_fingerprint(name: str, profession: str, skills: dict, verification_scores: dict, learning_path: dict, trending_skills: list) -> str:
+    payload = json.dumps([name, profession, skills, verification_scores, learning_path, trending_skills], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PdfExporter:
+    # Builds reports on a worker pool and keeps recent results by content hash, so identical
+    # requests (a second click, another replica's rerun, a cohort duplicate) reuse the same bytes
+    def __init__(self, max_workers: int, max_cached: int):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="elevatiq-pdf")
+        self.max_cached = max_cached
+        self.results = OrderedDict()
+        self.pending = {}
+        self._lock = threading.Lock()
+
+    def cached(self, fingerprint: str):
+        with self._lock:
+            pdf = self.results.get(fingerprint)
+            if pdf is not None:
+                self.results.move_to_end(fingerprint)
+            return pdf
+
+    def submit(self, *args) -> tuple:
+        fingerprint = pdf_fingerprint(*args)
+        with self._lock:
+            if fingerprint in self.results:
+                self.results.move_to_end(fingerprint)
+                future = Future()
+                future.set_result(self.results[fingerprint])
+                metrics.inc("elevatiq_pdf_cache_total", result="hit")
+                return fingerprint, future
+            if fingerprint in self.pending:
+                metrics.inc("elevatiq_pdf_cache_total", result="joined")
+                return fingerprint, self.pending[fingerprint]
+            metrics.inc("elevatiq_pdf_cache_total", result="miss")
+            future = self.pending[fingerprint] = self.executor.submit(export_to_pdf, *args)
+        future.add_done_callback(lambda done: self._store(fingerprint, done))
+        return fingerprint, future
+
+    def _store(self, fingerprint: str, future: Future):
+        with self._lock:
+            self.pending.pop(fingerprint, None)
+            if future.exception() is None:
+                self.results[fingerprint] = future.result()
+                while len(self.results) > self.max_cached:
+                    self.results.popitem(last=False)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_pdf_exporter() -> PdfExporter:
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = PdfExporter(
+                get_setting("pdf", "max_workers", 2),
+                get_setting("pdf", "max_cached", 200),
+            )
+            metrics.register_gauge("elevatiq_pdf_cache_entries", lambda: len(_exporter.results))
+        return _exporter
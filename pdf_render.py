@@ -0,0 +1,137 @@
+import io
+import threading
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable, SimpleDocTemplate, Paragraph, Spacer, Table
+
+from learning_path import learning_path_events
+from static_assets import get_logo_bytes
+
+_styles = None
+_logo = None
+_logo_loaded = False
+_resources_lock = threading.Lock()
+
+
+def get_styles() -> tuple:
+    # ParagraphStyles are immutable once built, so one set serves every report in the process
+    global _styles
+    with _resources_lock:
+        if _styles is None:
+            styles = getSampleStyleSheet()
+            _styles = (
+                ParagraphStyle('Header', parent=styles['Heading1'], fontSize=26, textColor=colors.Color(76/255, 81/255, 191/255), spaceAfter=15, alignment=1, fontName='Helvetica-Bold'),
+                ParagraphStyle('Subheader', parent=styles['Heading2'], fontSize=16, textColor=colors.grey, spaceAfter=10, alignment=1, fontName='Helvetica'),
+                ParagraphStyle('Body', parent=styles['BodyText'], fontSize=11, textColor=colors.black, leading=14, alignment=0, fontName='Helvetica'),
+                ParagraphStyle('Phase', parent=styles['Heading2'], fontSize=14, textColor=colors.Color(45/255, 55/255, 72/255), spaceAfter=8, alignment=1, fontName='Helvetica-Bold'),
+            )
+        return _styles
+
+
+def get_logo():
+    # Read and decode the logo once per process instead of once per report
+    global _logo, _logo_loaded
+    with _resources_lock:
+        if not _logo_loaded:
+            try:
+                _logo = ImageReader(io.BytesIO(get_logo_bytes()))
+                _logo.getRGBData()
+            except Exception:
+                _logo = None
+            _logo_loaded = True
+        return _logo
+
+
+class Logo(Flowable):
+    def __init__(self, image: ImageReader, width: float, height: float):
+        super().__init__()
+        self.image = image
+        self.width = width
+        self.height = height
+        self.hAlign = "CENTER"
+
+    def wrap(self, available_width, available_height):
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.drawImage(self.image, 0, 0, self.width, self.height, mask="auto")
+
+
+def render_pdf(name: str, profession: str, skills: dict, verification_scores: dict, learning_path: dict, trending_skills: list) -> bytes:
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75*inch, bottomMargin=0.75*inch, rightMargin=0.75*inch, leftMargin=0.75*inch)
+    header_style, subheader_style, body_style, phase_style = get_styles()
+
+    story = []
+
+    # Header Section
+    logo = get_logo()
+    if logo is not None:
+        story.append(Logo(logo, width=1.2*inch, height=1.2*inch))
+    else:
+        story.append(Paragraph("ElevatIQ", header_style))
+    story.append(Paragraph("Personalized Learning Path Report", header_style))
+    story.append(Paragraph("Empowering Your Professional Growth", body_style))
+    story.append(Spacer(1, 0.3*inch))
+
+    # User Details Section
+    story.append(Paragraph("User Information", subheader_style))
+    story.append(Paragraph(f"<b>Name:</b> {escape(name)}", body_style))
+    story.append(Paragraph(f"<b>Profession:</b> {escape(profession)}", body_style))
+    story.append(Spacer(1, 0.25*inch))
+
+    # Skills Table Section
+    story.append(Paragraph("Skill Assessment Summary", subheader_style))
+    skills_data = [["Skill", "Self-Rating", "Verification Score"]]
+    for skill, rating in skills.items():
+        v_score = verification_scores.get(skill, "N/A")
+        skills_data.append([skill, f"{rating}/10", f"{v_score}/10" if v_score != "N/A" else "N/A"])
+    skills_table = Table(skills_data, colWidths=[2.5*inch, 1.2*inch, 1.3*inch])
+    skills_table.setStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.Color(76/255, 81/255, 191/255)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+    story.append(skills_table)
+    story.append(Spacer(1, 0.25*inch))
+
+    # Trending Skills Section
+    story.append(Paragraph("Trending Skills on X", subheader_style))
+    trending_text = f"For {profession}: {', '.join(trending_skills) if trending_skills and trending_skills[0] != 'Error fetching trends' else 'No trending skills available'}"
+    story.append(Paragraph(escape(trending_text), body_style))
+    story.append(Spacer(1, 0.25*inch))
+
+    # Recommendations Section
+    story.append(Paragraph("Recommended Learning Path", subheader_style))
+    for phase, kind, payload in learning_path_events(learning_path):
+        if kind == "phase":
+            story.append(Paragraph(escape(payload), phase_style))
+        elif kind == "focus":
+            story.append(Paragraph(f"<b>Focus:</b> {escape(payload)}", body_style))
+        else:
+            if payload["url"] == "N/A":
+                url = ""
+            elif payload.get("link_status") == "dead":
+                url = " | <i>(link unavailable)</i>"
+            else:
+                url = f" | {escape(payload['url'])}"
+            story.append(Paragraph(f"<b>{escape(payload['skill'])}:</b> {escape(payload['type'])} | {escape(payload['name'])}{url} | {escape(payload['rationale'])}", body_style))
+    story.append(Spacer(1, 0.25*inch))
+
+    # Footer Section
+    story.append(Paragraph("Report Generated by ElevatIQ | © 2025 ElevatIQ", body_style))
+
+    # Build the PDF
+    doc.build(story)
+    return buffer.getvalue()
@@ -0,0 +1,235 @@
+import json
+import time
+from functools import partial
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from concurrency import LimiterTimeout, gemini_flight, gemini_limiter
+from gemini_client import CircuitOpenError, GeminiError, get_gemini_client
+from llm_cache import get_response_cache, is_error_response, prompt_key
+from metrics import SIZE_BUCKETS, metrics
+from prompt_budget import WORD_PATTERN, compact_answers, estimate_tokens, prompt_budget, record_prompt
+from scoring import ScoringEngine
+from structured_output import (
+    LEARNING_PATH_SCHEMA, SCORES_SCHEMA, VERIFICATION_SCHEMA, SchemaError, StructuredOutputError,
+    build_repair_prompt, parse_learning_path, parse_scores, parse_verification, to_learning_path,
+)
+from trending import get_trending_cache
+
+# The assessment pipeline without any Streamlit UI: app.py, the cohort runner and the API all call these
+
+# The Gemini client, response cache and trending cache are process-wide singletons built on first use,
+# so importing this module stays cheap and a cold start does not wait on SQLite, X or Gemini setup
+
+GEMINI_QUEUE_TIMEOUT = 30
+
+metrics.register_gauge("elevatiq_gemini_queue_waiting", gemini_limiter.waiting)
+metrics.register_gauge("elevatiq_gemini_in_flight", gemini_flight.in_flight)
+
+
+def current_session_id() -> str:
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else "background"
+
+
+def gemini_error_message(error: Exception) -> str:
+    if isinstance(error, (CircuitOpenError, LimiterTimeout)):
+        return "Error: Our AI service is busy right now. Please try again in a minute."
+    return f"Error: {error}"
+
+
+def cache_prompt(prompt: str, response_schema: dict = None) -> str:
+    # JSON-mode answers are cached separately from free-text answers to the same prompt
+    if response_schema is None:
+        return prompt
+    return f"{prompt}\n{json.dumps(response_schema, sort_keys=True)}"
+
+
+def call_gemini(prompt: str, session_id: str, response_schema: dict = None) -> str:
+    with gemini_limiter.slot(session_id, GEMINI_QUEUE_TIMEOUT):
+        # Another replica or an earlier leader may have filled the cache while we queued
+        cached = get_response_cache().get(cache_prompt(prompt, response_schema), count=False)
+        if cached is not None:
+            return cached
+        text = get_gemini_client().generate(prompt, response_schema=response_schema)
+    get_response_cache().set(cache_prompt(prompt, response_schema), text)
+    return text
+
+
+def get_gemini_response(prompt: str, session_id: str = None, response_schema: dict = None, stage: str = "other") -> str:
+    cached = get_response_cache().get(cache_prompt(prompt, response_schema))
+    if cached is not None:
+        metrics.inc("elevatiq_gemini_cache_total", stage=stage, result="hit")
+        return cached
+    metrics.inc("elevatiq_gemini_cache_total", stage=stage, result="miss")
+    metrics.observe("elevatiq_gemini_prompt_chars", len(prompt), SIZE_BUCKETS, stage=stage)
+    record_prompt(prompt, stage)
+    session_id = session_id or current_session_id()
+    try:
+        with metrics.timer("elevatiq_gemini_request_seconds", stage=stage):
+            # Identical in-flight prompts from any session share one upstream request
+            response = gemini_flight.do(prompt_key(cache_prompt(prompt, response_schema)), lambda: call_gemini(prompt, session_id, response_schema))
+    except (GeminiError, LimiterTimeout) as e:
+        metrics.inc("elevatiq_gemini_errors_total", stage=stage, error=type(e).__name__)
+        return gemini_error_message(e)
+    metrics.observe("elevatiq_gemini_response_chars", len(response), SIZE_BUCKETS, stage=stage)
+    return response
+
+
+def timed_parse(parse, response: str, stage: str):
+    with metrics.timer("elevatiq_parse_seconds", stage=stage):
+        return parse(response)
+
+
+def get_structured_response(prompt: str, response_schema: dict, parse, session_id: str = None, stage: str = "other"):
+    response = get_gemini_response(prompt, session_id, response_schema, stage)
+    if is_error_response(response):
+        raise StructuredOutputError(response)
+    try:
+        return timed_parse(parse, response, stage)
+    except SchemaError as e:
+        # One repair round trip instead of making the user resubmit the whole step
+        metrics.inc("elevatiq_schema_repairs_total", stage=stage)
+        get_response_cache().invalidate(cache_prompt(prompt, response_schema))
+        repaired = get_gemini_response(build_repair_prompt(prompt, response, e), session_id, response_schema, stage)
+        if is_error_response(repaired):
+            raise StructuredOutputError(repaired)
+        try:
+            result = timed_parse(parse, repaired, stage)
+        except SchemaError as e:
+            metrics.inc("elevatiq_schema_failures_total", stage=stage)
+            raise StructuredOutputError(f"Error: The AI response could not be understood ({e}). Please try again.")
+        get_response_cache().set(cache_prompt(prompt, response_schema), repaired)
+        return result
+
+
+def stream_gemini_response(prompt: str, session_id: str = None, stage: str = "other"):
+    # Yields text chunks as Gemini produces them; a cache hit arrives as a single chunk
+    cached = get_response_cache().get(prompt)
+    if cached is not None:
+        metrics.inc("elevatiq_gemini_cache_total", stage=stage, result="hit")
+        yield cached
+        return
+    metrics.inc("elevatiq_gemini_cache_total", stage=stage, result="miss")
+    metrics.observe("elevatiq_gemini_prompt_chars", len(prompt), SIZE_BUCKETS, stage=stage)
+    record_prompt(prompt, stage)
+    chunks = []
+    start = time.perf_counter()
+    try:
+        with gemini_limiter.slot(session_id or current_session_id(), GEMINI_QUEUE_TIMEOUT):
+            for chunk in get_gemini_client().stream(prompt):
+                if not chunks:
+                    metrics.observe("elevatiq_gemini_first_chunk_seconds", time.perf_counter() - start, stage=stage)
+                chunks.append(chunk)
+                yield chunk
+    except (GeminiError, LimiterTimeout) as e:
+        metrics.inc("elevatiq_gemini_errors_total", stage=stage, error=type(e).__name__)
+        raise
+    metrics.observe("elevatiq_gemini_request_seconds", time.perf_counter() - start, stage=stage)
+    response = "".join(chunks).strip()
+    metrics.observe("elevatiq_gemini_response_chars", len(response), SIZE_BUCKETS, stage=stage)
+    get_response_cache().set(prompt, response)
+
+
+def fetch_trending_skills(profession: str) -> list:
+    try:
+        with metrics.timer("elevatiq_trending_seconds"):
+            return get_trending_cache().get(profession)
+    except Exception as e:
+        metrics.inc("elevatiq_trending_errors_total", error=type(e).__name__)
+        raise
+
+
+def fetch_suggested_skills(profession: str, session_id: str = None) -> list:
+    prompt = (
+        f"You are an expert career advisor. For a '{profession}', "
+        f"suggest 8-10 key skills that are essential for success in this profession. "
+        f"Return the skills as a comma-separated list (e.g., 'Python, Machine Learning, Data Analysis')."
+    )
+    skills_response = get_gemini_response(prompt, session_id, stage="skills")
+    return [skill.strip() for skill in skills_response.split(",") if skill.strip()]
+
+
+def get_verification_questions_and_prerequisites(profession: str, skills: dict, session_id: str = None) -> tuple:
+    skill_ratings = "\n".join([f"{skill}: {rating}/10" for skill, rating in skills.items()])
+    prompt = (
+        f"You are an expert in skill assessment. For a {profession}, "
+        f"the user has rated their skills as follows:\n{skill_ratings}\n"
+        f"1. Generate one open-ended question per skill to verify proficiency. "
+        f"2. Provide a brief hint for each question. "
+        f"3. For skills rated below 5/10, suggest one prerequisite skill; otherwise leave prerequisite null. "
+        f"Return JSON with a 'questions' array of objects with 'skill' (exactly as listed above), 'question', 'hint' and 'prerequisite'."
+    )
+    verification = get_structured_response(prompt, VERIFICATION_SCHEMA, parse_verification, session_id, stage="verification")
+    questions = {item.skill: {"question": item.question, "hint": item.hint} for item in verification}
+    prerequisites = {item.skill: item.prerequisite for item in verification if item.prerequisite}
+    return questions, prerequisites
+
+
+def score_answer_batch(profession: str, items: list, session_id: str = None) -> dict:
+    prompt = (
+        f"You are an expert assessor. You are given the following verification answers for a {profession}. "
+        f"Evaluate each answer independently based on depth and relevance to its question and score it out of 10. The answers are:\n" +
+        "\n".join([f"{skill}: Question: {question} Answer: {answer}" for skill, question, answer in items]) +
+        "\nReturn JSON with a 'scores' array of objects with 'skill' (exactly as listed above) and 'score' (an integer from 0 to 10)."
+    )
+    return {item.skill: item.score for item in get_structured_response(prompt, SCORES_SCHEMA, parse_scores, session_id, stage="scoring")}
+
+
+def score_verification_answers(profession: str, questions: dict, answers: dict, session_id: str = None) -> tuple:
+    engine = ScoringEngine(partial(score_answer_batch, session_id=session_id or current_session_id()))
+    items = [(skill, questions.get(skill, {}).get("question", ""), answer) for skill, answer in answers.items()]
+    return engine.score(profession, items)
+
+
+def build_recommendation_prompt(profession: str, skills: dict, answers: dict, scores: dict, prerequisites: dict, trending_skills: list, structured: bool = False) -> str:
+    prompt = recommendation_prompt(profession, skills, answers, scores, prerequisites, trending_skills, structured)
+    budget = prompt_budget("recommendations")
+    if not budget or estimate_tokens(prompt) <= budget:
+        return prompt
+    # Over budget: only the free-text answers shrink; ratings, scores and prerequisites are always sent whole
+    answers = {skill: answers[skill] for skill in skills if skill in answers}
+    base_tokens = estimate_tokens(recommendation_prompt(profession, skills, {skill: "" for skill in answers}, scores, prerequisites, trending_skills, structured))
+    keywords = {skill: set(WORD_PATTERN.findall(f"{skill} {profession}".casefold())) for skill in answers}
+    answers, level = compact_answers(answers, scores, budget - base_tokens, keywords)
+    metrics.inc("elevatiq_prompt_compactions_total", stage="recommendations", level=level)
+    return recommendation_prompt(profession, skills, answers, scores, prerequisites, trending_skills, structured)
+
+
+def recommendation_prompt(profession: str, skills: dict, answers: dict, scores: dict, prerequisites: dict, trending_skills: list, structured: bool) -> str:
+    skill_info = "\n".join([f"{skill}: Self-rated {rating}/10, Verification: {answers.get(skill, 'Not provided')}, Score: {scores.get(skill, 'N/A')}/10, Prerequisite: {prerequisites.get(skill, 'None')}"
+                           for skill, rating in skills.items()])
+    trending_info = f"Trending skills on X for {profession}: {', '.join(trending_skills)}"
+    prompt = (
+        f"You are an expert education consultant. For a '{profession}', "
+        f"the user has this skill profile:\n{skill_info}\n"
+        f"Additionally, consider these trending skills from X: {trending_info}\n"
+        f"Provide a detailed, personalized learning path with 3 phases (Beginner, Intermediate, Advanced). "
+    )
+    if structured:
+        return prompt + (
+            "Return JSON with a 'phases' array. Each phase has 'name' (Beginner, Intermediate or Advanced), 'duration', "
+            "'focus' and a 'recommendations' array of objects with 'skill', 'type' (resource type), 'name' (resource name), "
+            "'url' (empty if not available) and 'rationale'."
+        )
+    prompt += (
+        "Use this format for each phase:\n"
+        "- Phase: [Phase Name] - [Duration]\n"
+        "  - Focus: [Brief description of focus]\n"
+        "  - [Skill]: [Resource Type] | [Resource Name] | [URL (if available)] | [Rationale]\n"
+        "Ensure the output is plain text with one recommendation per line."
+    )
+    return prompt
+
+
+def get_dynamic_recommendations(profession: str, skills: dict, answers: dict, scores: dict, prerequisites: dict, trending_skills: list) -> str:
+    return get_gemini_response(build_recommendation_prompt(profession, skills, answers, scores, prerequisites, trending_skills), stage="recommendations")
+
+
+def stream_dynamic_recommendations(profession: str, skills: dict, answers: dict, scores: dict, prerequisites: dict, trending_skills: list):
+    return stream_gemini_response(build_recommendation_prompt(profession, skills, answers, scores, prerequisites, trending_skills), stage="recommendations")
+
+
+def get_learning_path(profession: str, skills: dict, answers: dict, scores: dict, prerequisites: dict, trending_skills: list, session_id: str = None) -> dict:
+    prompt = build_recommendation_prompt(profession, skills, answers, scores, prerequisites, trending_skills, structured=True)
+    return to_learning_path(get_structured_response(prompt, LEARNING_PATH_SCHEMA, parse_learning_path, session_id, stage="recommendations"))
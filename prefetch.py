@@ -0,0 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from config import get_setting
+
+# Process-wide pool shared by every session; tasks must not touch st.* since they run outside a script thread
+_executor = ThreadPoolExecutor(
+    max_workers=get_setting("prefetch", "max_workers", 8),
+    thread_name_prefix="elevatiq-prefetch",
+)
+
+
+def submit(task, *args, **kwargs):
+    return _executor.submit(task, *args, **kwargs)
+
+
+def start_profession_prefetch(profession: str, tasks: dict) -> dict:
+    # Everything here depends only on the profession, so it can start as soon as Step 1 is submitted
+    return {name: submit(task, profession) for name, task in tasks.items()}
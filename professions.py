@@ -0,0 +1,147 @@
+import json
+import re
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+
+from config import get_setting
+from metrics import metrics
+
+# Free-text professions collapse onto the curated names in assets/data/professions.json, so suggestions,
+# trending searches and cached Gemini responses are shared by "SWE", "software engineer " and "Sofware
+# Enginer". Anything not in the table keeps the user's own wording; nothing is learned at runtime, so
+# every replica resolves the same input to the same name
+
+DEFAULT_PROFESSIONS_PATH = "assets/data/professions.json"
+SEPARATOR_PATTERN = re.compile(r"[\s_\-/.,;:()]+")
+DIGITS_PATTERN = re.compile(r"\d+")
+MAX_FUZZY_CANDIDATES = 5
+
+
+def normalize_profession(text: str) -> str:
+    return SEPARATOR_PATTERN.sub(" ", text.casefold()).strip()
+
+
+def trigrams(normalized: str) -> set:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def within_one_edit(word: str, other: str) -> bool:
+    # One insertion, deletion, substitution or swap of adjacent letters
+    if word == other:
+        return True
+    if abs(len(word) - len(other)) > 1:
+        return False
+    if len(word) == len(other):
+        diffs = [i for i, (a, b) in enumerate(zip(word, other)) if a != b]
+        return len(diffs) == 1 or (
+            len(diffs) == 2 and diffs[1] == diffs[0] + 1 and word[diffs[0]] == other[diffs[1]] and word[diffs[1]] == other[diffs[0]]
+        )
+    shorter, longer = sorted((word, other), key=len)
+    i = next((i for i, (a, b) in enumerate(zip(shorter, longer)) if a != b), len(shorter))
+    return shorter[i:] == longer[i + 1:]
+
+
+def is_typo(word: str, other: str) -> bool:
+    # A trailing "s" changes a title rather than misspelling it ("accounts", "sales", "operations")
+    return within_one_edit(word, other) and word + "s" != other and other + "s" != word
+
+
+def is_typo_of(text: str, alias: str, min_ratio: float) -> bool:
+    # Same words with at most one typo each, same numbers, and close overall: "sofware enginer" passes,
+    # "web developer" is not "web3 developer" and "senior software engineer" is not "software engineer"
+    words, alias_words = text.split(), alias.split()
+    return (
+        len(words) == len(alias_words)
+        and DIGITS_PATTERN.findall(text) == DIGITS_PATTERN.findall(alias)
+        and all(is_typo(word, alias_word) for word, alias_word in zip(words, alias_words))
+        and SequenceMatcher(None, text, alias).ratio() >= min_ratio
+    )
+
+
+class ProfessionIndex:
+    # Exact lookup over normalized aliases first; misses fall back to a trigram index scored by Dice
+    # similarity, and a candidate is accepted only if it differs from the input by typos alone
+    def __init__(self, professions: dict, threshold: float = 0.6, min_ratio: float = 0.85):
+        self.threshold = threshold
+        self.min_ratio = min_ratio
+        self.aliases = {}
+        self.grams = {}
+        self.postings = {}
+        for profession, aliases in professions.items():
+            for alias in {profession, *aliases}:
+                self._add(normalize_profession(alias), profession)
+
+    def _add(self, normalized: str, profession: str):
+        if not normalized or normalized in self.aliases:
+            return
+        self.aliases[normalized] = profession
+        grams = trigrams(normalized)
+        self.grams[normalized] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(normalized)
+
+    def _fuzzy(self, normalized: str):
+        grams = trigrams(normalized)
+        overlap = Counter()
+        for gram in grams:
+            overlap.update(self.postings.get(gram, ()))
+        scored = sorted(
+            ((2 * shared / (len(grams) + len(self.grams[candidate])), candidate) for candidate, shared in overlap.items()),
+            reverse=True,
+        )
+        for score, candidate in scored[:MAX_FUZZY_CANDIDATES]:
+            if score < self.threshold:
+                break
+            if is_typo_of(normalized, candidate, self.min_ratio):
+                return self.aliases[candidate]
+        return None
+
+    def lookup(self, text: str):
+        # Curated profession name, or None when the input matches nothing in the table
+        normalized = normalize_profession(text)
+        if not normalized:
+            return None
+        profession = self.aliases.get(normalized)
+        if profession is not None:
+            metrics.inc("elevatiq_profession_lookups_total", match="exact")
+            return profession
+        profession = self._fuzzy(normalized)
+        metrics.inc("elevatiq_profession_lookups_total", match="fuzzy" if profession else "miss")
+        return profession
+
+    def size(self) -> int:
+        return len(self.aliases)
+
+
+def load_professions(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_profession_index() -> ProfessionIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ProfessionIndex(
+                load_professions(get_setting("professions", "path", DEFAULT_PROFESSIONS_PATH)),
+                threshold=get_setting("professions", "fuzzy_threshold", 0.6),
+                min_ratio=get_setting("professions", "min_ratio", 0.85),
+            )
+            metrics.register_gauge("elevatiq_profession_aliases", _index.size)
+        return _index
+
+
+def resolve_profession(text: str) -> str:
+    # Display name: the curated name on a match, otherwise the user's own text
+    return get_profession_index().lookup(text) or re.sub(r"\s+", " ", text).strip()
+
+
+def profession_key(text: str) -> str:
+    # Cache key: the curated name on a match, otherwise the normalized input
+    return normalize_profession(get_profession_index().lookup(text) or text)
@@ -0,0 +1,98 @@
+import math
+import re
+
+from config import get_setting
+from metrics import SIZE_BUCKETS, metrics
+
+# Prompt sizes are estimated before anything goes to Gemini, so each stage can be held to a token budget.
+# English averages about four characters per token; non-ASCII text (Hindi answers) costs about two
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?।])\s+")
+WORD_PATTERN = re.compile(r"\w+")
+DEFAULT_BUDGETS = {"recommendations": 3000}
+MIN_ANSWER_TOKENS = 24
+SCORED_PLACEHOLDER = "(summarized by its score)"
+
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 2)
+
+
+def prompt_budget(stage: str):
+    return get_setting("prompts", f"{stage}_max_tokens", DEFAULT_BUDGETS.get(stage))
+
+
+def record_prompt(prompt: str, stage: str) -> int:
+    tokens = estimate_tokens(prompt)
+    metrics.observe("elevatiq_gemini_prompt_tokens", tokens, SIZE_BUCKETS, stage=stage)
+    budget = prompt_budget(stage)
+    if budget and tokens > budget:
+        metrics.inc("elevatiq_prompt_over_budget_total", stage=stage)
+    return tokens
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # Same per-character costs as estimate_tokens, with a token left over for the ellipsis
+    cost, end = 0.0, 0
+    for end, char in enumerate(text):
+        cost += 0.25 if char.isascii() else 0.5
+        if cost > max_tokens - 1:
+            break
+    cut = text[:end]
+    return cut[:cut.rfind(" ")].rstrip(",;:") + "…" if " " in cut else cut + "…"
+
+
+def key_sentences(text: str, max_tokens: int, keywords: set) -> str:
+    # Keeps the sentences that mention the skill, carry numbers or open the answer, in their original order
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sentences = [s.strip() for s in SENTENCE_PATTERN.split(text.strip()) if s.strip()]
+
+    def weight(index: int, sentence: str) -> float:
+        words = set(WORD_PATTERN.findall(sentence.casefold()))
+        return 2 * len(words & keywords) + sum(word.isdigit() for word in words) + (2 if index == 0 else 0)
+
+    ranked = sorted(range(len(sentences)), key=lambda i: (-weight(i, sentences[i]), i))
+    kept, used = set(), 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost <= max_tokens:
+            kept.add(i)
+            used += cost
+    if not kept:
+        return truncate(sentences[ranked[0]], max_tokens)
+    return " ".join(sentences[i] for i in sorted(kept))
+
+
+def fair_shares(sizes: dict, budget: int) -> dict:
+    # Answers under an equal share keep their full length, and what they leave unused goes to the longer ones
+    shares = {}
+    remaining = budget
+    for position, (key, size) in enumerate(sorted(sizes.items(), key=lambda item: item[1])):
+        share = max(MIN_ANSWER_TOKENS, remaining // (len(sizes) - position))
+        shares[key] = min(size, share)
+        remaining -= shares[key]
+    return shares
+
+
+def compact_answers(answers: dict, scores: dict, max_tokens: int, keywords: dict) -> tuple:
+    # Cheapest loss first: trim answers to their key sentences, then let a computed score stand in for
+    # the answer text, then hard-truncate what is left. Returns (answers, level applied)
+    sizes = {skill: estimate_tokens(answer) for skill, answer in answers.items()}
+    if sum(sizes.values()) <= max_tokens:
+        return answers, "none"
+    shares = fair_shares(sizes, max_tokens)
+    compacted = {skill: key_sentences(answer, shares[skill], keywords.get(skill, set())) for skill, answer in answers.items()}
+    if sum(map(estimate_tokens, compacted.values())) <= max_tokens:
+        return compacted, "key_sentences"
+    unscored = {skill: answer for skill, answer in compacted.items() if skill not in scores}
+    compacted = {skill: unscored.get(skill, SCORED_PLACEHOLDER) for skill in compacted}
+    if sum(map(estimate_tokens, compacted.values())) <= max_tokens:
+        return compacted, "scores"
+    placeholders = estimate_tokens(SCORED_PLACEHOLDER) * (len(compacted) - len(unscored))
+    shares = fair_shares({skill: estimate_tokens(answer) for skill, answer in unscored.items()}, max_tokens - placeholders)
+    compacted.update({skill: truncate(answer, shares[skill]) for skill, answer in unscored.items()})
+    return compacted, "truncated"
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from sqlalchemy import Column, Float, Integer, String, Text, delete, func, select
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from db import make_engine
+from llm_cache import is_error_response, prompt_key
+
+Base = declarative_base()
+
+
+class CachedResponse(Base):
+    __tablename__ = "llm_responses"
+
+    key = Column(String(64), primary_key=True)
+    response = Column(Text, nullable=False)
+    created_at = Column(Float, nullable=False)
+    last_accessed = Column(Float, nullable=False, index=True)
+    hits = Column(Integer, nullable=False, default=0)
+
+
+class ResponseCache:
+    def __init__(self, url: str, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.engine = make_engine(url)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, prompt: str, count: bool = True):
+        # count=False re-checks without touching the hit/miss stats, so one lookup is never counted twice
+        key = prompt_key(prompt)
+        now = time.time()
+        with self.Session() as session:
+            entry = session.get(CachedResponse, key)
+            if entry is not None and now - entry.created_at > self.ttl_seconds:
+                session.delete(entry)
+                session.commit()
+                entry = None
+            if entry is None:
+                if count:
+                    self._count(hit=False)
+                return None
+            entry.last_accessed = now
+            entry.hits += 1
+            response = entry.response
+            session.commit()
+        if count:
+            self._count(hit=True)
+        return response
+
+    def set(self, prompt: str, response: str):
+        # Error strings like "Error: Received status code 429" must never be served as answers
+        if is_error_response(response):
+            return
+        now = time.time()
+        with self.Session() as session:
+            session.merge(CachedResponse(key=prompt_key(prompt), response=response, created_at=now, last_accessed=now, hits=0))
+            session.commit()
+            self._evict(session, now)
+
+    def invalidate(self, prompt: str):
+        with self.Session() as session:
+            session.execute(delete(CachedResponse).where(CachedResponse.key == prompt_key(prompt)))
+            session.commit()
+
+    def _evict(self, session, now: float):
+        session.execute(delete(CachedResponse).where(CachedResponse.created_at < now - self.ttl_seconds))
+        overflow = session.scalar(select(func.count()).select_from(CachedResponse)) - self.max_entries
+        if overflow > 0:
+            lru_keys = select(CachedResponse.key).order_by(CachedResponse.last_accessed).limit(overflow)
+            session.execute(delete(CachedResponse).where(CachedResponse.key.in_(lru_keys)))
+        session.commit()
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        with self.Session() as session:
+            entries = session.scalar(select(func.count()).select_from(CachedResponse))
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        with self.Session() as session:
+            session.execute(delete(CachedResponse))
+            session.commit()
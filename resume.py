@@ -0,0 +1,46 @@
+import secrets
+import threading
+
+from config import get_setting
+from llm_cache import is_error_response
+
+# Server-side checkpoints of a session's completed stages, so a reconnect, restart or misclick
+# resumes at the same step without repeating any Gemini calls
+
+CHECKPOINT_FIELDS = (
+    "form_submitted", "name", "email", "profession", "language", "suggested_skills", "selected_skills",
+    "verification_questions", "prerequisites", "verification_answers", "verification_scores",
+    "skills_verified", "trending_skills", "learning_path",
+)
+
+
+def new_resume_token() -> str:
+    return secrets.token_urlsafe(16)
+
+
+def is_failed_result(value) -> bool:
+    # Failed stages leave their error text where the result would be: ["Error: ..."] or ["Error fetching trends"]
+    return isinstance(value, list) and bool(value) and isinstance(value[0], str) and (
+        is_error_response(value[0]) or value[0] == "Error fetching trends"
+    )
+
+
+def snapshot(state) -> dict:
+    # Failed results are left out, so a resumed session asks again instead of replaying the error
+    return {field: state[field] for field in CHECKPOINT_FIELDS if field in state and not is_failed_result(state[field])}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            from resume_store import CheckpointStore
+            _store = CheckpointStore(
+                get_setting("checkpoint", "url", "sqlite:///elevatiq_sessions.db"),
+                get_setting("checkpoint", "ttl_seconds", 7 * 24 * 3600),
+            )
+        return _store
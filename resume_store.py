@@ -0,0 +1,56 @@
+import json
+import time
+import zlib
+
+from sqlalchemy import Column, Float, LargeBinary, String, delete
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from db import make_engine
+
+Base = declarative_base()
+
+
+class SessionCheckpoint(Base):
+    __tablename__ = "session_checkpoints"
+
+    token = Column(String(64), primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    updated_at = Column(Float, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
+
+
+def encode(data: dict) -> bytes:
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+
+def decode(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class CheckpointStore:
+    def __init__(self, url: str, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.engine = make_engine(url)
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def save(self, token: str, data: dict):
+        now = time.time()
+        with self.Session() as session:
+            session.merge(SessionCheckpoint(
+                token=token, data=encode(data), updated_at=now, expires_at=now + self.ttl_seconds,
+            ))
+            session.execute(delete(SessionCheckpoint).where(SessionCheckpoint.expires_at < now))
+            session.commit()
+
+    def load(self, token: str):
+        with self.Session() as session:
+            checkpoint = session.get(SessionCheckpoint, token)
+            if checkpoint is None or checkpoint.expires_at < time.time():
+                return None
+            return decode(checkpoint.data)
+
+    def delete(self, token: str):
+        with self.Session() as session:
+            session.execute(delete(SessionCheckpoint).where(SessionCheckpoint.token == token))
+            session.commit()
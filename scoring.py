@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+from config import get_setting
+from llm_cache import get_response_cache
+from metrics import metrics
+from prefetch import submit
+
+SCORE_BATCH_SIZE = get_setting("scoring", "batch_size", 5)
+
+
+def answer_hash(profession: str, skill: str, question: str, answer: str) -> str:
+    payload = json.dumps([profession.strip().casefold(), skill.strip(), question.strip(), answer.strip()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ScoringEngine:
+    # Scores each (profession, skill, question, answer) on its own: unchanged answers are served from
+    # the memo, and only new or edited ones are sent to Gemini in bounded, concurrently dispatched batches
+    def __init__(self, score_batch, memo=None, batch_size: int = SCORE_BATCH_SIZE):
+        self.score_batch = score_batch
+        self.memo = memo if memo is not None else get_response_cache()
+        self.batch_size = batch_size
+
+    def _memo_key(self, digest: str) -> str:
+        return f"verification-score:{digest}"
+
+    def score(self, profession: str, items: list) -> tuple:
+        # items: [(skill, question, answer)]; returns ({skill: score}, [errors])
+        scores = {}
+        pending = []
+        for skill, question, answer in items:
+            digest = answer_hash(profession, skill, question, answer)
+            # Counted under elevatiq_score_memo_total, not in the response cache's Gemini hit/miss stats
+            cached = self.memo.get(self._memo_key(digest), count=False)
+            if cached is not None:
+                metrics.inc("elevatiq_score_memo_total", result="hit")
+                scores[skill] = int(cached)
+            else:
+                metrics.inc("elevatiq_score_memo_total", result="miss")
+                pending.append((digest, skill, question, answer))
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        if len(batches) == 1:
+            results = [self._run_batch(profession, batches[0])]
+        else:
+            results = [future.result() for future in [submit(self._run_batch, profession, batch) for batch in batches]]
+
+        errors = []
+        for batch_scores, error in results:
+            scores.update(batch_scores)
+            if error:
+                errors.append(error)
+        return {skill: scores[skill] for skill, _, _ in items if skill in scores}, errors
+
+    def _run_batch(self, profession: str, batch: list) -> tuple:
+        try:
+            batch_scores = self.score_batch(profession, [(skill, question, answer) for _, skill, question, answer in batch])
+        except Exception as e:
+            return {}, str(e)
+        scored = {}
+        for digest, skill, _, _ in batch:
+            if skill in batch_scores:
+                scored[skill] = batch_scores[skill]
+                self.memo.set(self._memo_key(digest), str(batch_scores[skill]))
+        return scored, None
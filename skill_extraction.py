@@ -0,0 +1,90 @@
+import json
+import re
+import threading
+from collections import Counter, deque
+
+from config import get_setting
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+[+#]*")
+DEFAULT_TAXONOMY_PATH = "assets/data/skills_taxonomy.json"
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def load_taxonomy(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class SkillMatcher:
+    # Aho-Corasick automaton over word tokens rather than characters, so every alias
+    # matches on word boundaries ("ai" never fires inside "said", "java" never inside "javascript")
+    # and each text is scanned once regardless of taxonomy size
+    def __init__(self, taxonomy: dict):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+        for skill, aliases in taxonomy.items():
+            # Only the listed aliases match, never the bare display name, so skills named with everyday words
+            # (Go, Excel, Rust, Swift, Spring) fire only on qualified forms like "golang" or "microsoft excel"
+            for alias in aliases or [skill]:
+                self._add(tokenize(alias), skill)
+        self._build_failure_links()
+
+    def _add(self, tokens: list, skill: str):
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            if token not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(set())
+                self.goto[node][token] = len(self.goto) - 1
+            node = self.goto[node][token]
+        self.output[node].add(skill)
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] |= self.output[self.fail[child]]
+
+    def find(self, text: str) -> set:
+        found = set()
+        node = 0
+        for token in tokenize(text):
+            while node and token not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(token, 0)
+            found |= self.output[node]
+        return found
+
+    def top_k(self, texts, k: int = 5, min_count: int = 2) -> list:
+        # Each text counts a skill at most once, so one spammy tweet can't dominate the ranking
+        counts = Counter()
+        for text in texts:
+            counts.update(self.find(text))
+        return [skill for skill, count in counts.most_common() if count >= min_count][:k]
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher() -> SkillMatcher:
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = SkillMatcher(load_taxonomy(get_setting("trending", "taxonomy_path", DEFAULT_TAXONOMY_PATH)))
+        return _matcher
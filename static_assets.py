@@ -0,0 +1,89 @@
+import base64
+import os
+import threading
+
+# Static files and markup are read and built once per process; Streamlit reruns only re-send them
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+STYLES_PATH = os.path.join(ASSET_DIR, "styles.css")
+LOGO_PATH = os.path.join(ASSET_DIR, "assets", "images", "logo.png")
+
+SPLASH_CSS = """
+    .splash-screen {
+        position: fixed;
+        top: 0;
+        left: 0;
+        width: 100%;
+        height: 100%;
+        background: #ffffff;
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        flex-direction: column;
+        z-index: 1000;
+    }
+
+    .logo-animation {
+        width: 200px;
+        height: 200px;
+        animation: pulse 1.5s infinite alternate, rotate 4s linear infinite;
+    }
+
+    @keyframes pulse {
+        from { transform: scale(1); }
+        to { transform: scale(1.1); }
+    }
+
+    @keyframes rotate {
+        from { transform: rotate(0deg); }
+        to { transform: rotate(360deg); }
+    }
+"""
+
+SIDEBAR_HTML = """
+    <h1 style='color: #ffffff;'>ElevatIQ</h1>
+    <div style='margin-top: 20px;'>
+        <a href='#' style='color: #edf2f7; text-decoration: none; font-size: 1.1em; display: block; margin: 10px 0;'>🏠 Home</a>
+        <a href='#' style='color: #edf2f7; text-decoration: none; font-size: 1.1em; display: block; margin: 10px 0;'>👤 Profile</a>
+        <a href='#' style='color: #edf2f7; text-decoration: none; font-size: 1.1em; display: block; margin: 10px 0;'>📚 Recommendations</a>
+    </div>
+"""
+
+_assets = {}
+_assets_lock = threading.RLock()
+
+
+def _load(name: str, build):
+    with _assets_lock:
+        if name not in _assets:
+            _assets[name] = build()
+        return _assets[name]
+
+
+def _read(path: str, mode: str = "r"):
+    with open(path, mode) as f:
+        return f.read()
+
+
+def get_logo_bytes() -> bytes:
+    return _load("logo", lambda: _read(LOGO_PATH, "rb"))
+
+
+def get_logo_data_uri() -> str:
+    # Inlined into the splash so browsers don't fetch the logo from an external host
+    return _load("logo_uri", lambda: "data:image/png;base64," + base64.b64encode(get_logo_bytes()).decode("ascii"))
+
+
+def get_stylesheet() -> str:
+    return _load("stylesheet", lambda: f"<style>{_read(STYLES_PATH)}</style>")
+
+
+def get_splash_markup() -> str:
+    # Only sent on a session's first run, so its CSS and the inline logo never ride along on reruns
+    return _load("splash", lambda: f"""
+    <style>{SPLASH_CSS}</style>
+    <div class="splash-screen">
+        <img src="{get_logo_data_uri()}" alt="ElevatIQ Logo" class="logo-animation">
+        <p style="color: #4c51bf; font-size: 24px; margin-top: 20px;">Loading ElevatIQ...</p>
+    </div>
+""")
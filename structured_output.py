@@ -0,0 +1,215 @@
+import json
+from dataclasses import dataclass, field
+
+from learning_path import NO_URL_VALUES, PHASES, empty_learning_path
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class StructuredOutputError(Exception):
+    pass
+
+
+@dataclass
+class VerificationQuestion:
+    skill: str
+    question: str
+    hint: str
+    prerequisite: str = None
+
+
+@dataclass
+class SkillScore:
+    skill: str
+    score: int
+
+
+@dataclass
+class Recommendation:
+    skill: str
+    type: str
+    name: str
+    url: str
+    rationale: str
+
+
+@dataclass
+class Phase:
+    name: str
+    duration: str
+    focus: str
+    recommendations: list = field(default_factory=list)
+
+
+# Response schemas use the OpenAPI subset accepted by Gemini's responseSchema
+VERIFICATION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "questions": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "skill": {"type": "STRING"},
+                    "question": {"type": "STRING"},
+                    "hint": {"type": "STRING"},
+                    "prerequisite": {"type": "STRING", "nullable": True},
+                },
+                "required": ["skill", "question", "hint"],
+            },
+        },
+    },
+    "required": ["questions"],
+}
+
+SCORES_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "scores": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "skill": {"type": "STRING"},
+                    "score": {"type": "INTEGER"},
+                },
+                "required": ["skill", "score"],
+            },
+        },
+    },
+    "required": ["scores"],
+}
+
+LEARNING_PATH_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "phases": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "name": {"type": "STRING", "enum": list(PHASES)},
+                    "duration": {"type": "STRING"},
+                    "focus": {"type": "STRING"},
+                    "recommendations": {
+                        "type": "ARRAY",
+                        "items": {
+                            "type": "OBJECT",
+                            "properties": {
+                                "skill": {"type": "STRING"},
+                                "type": {"type": "STRING"},
+                                "name": {"type": "STRING"},
+                                "url": {"type": "STRING"},
+                                "rationale": {"type": "STRING"},
+                            },
+                            "required": ["skill", "type", "name", "url", "rationale"],
+                        },
+                    },
+                },
+                "required": ["name", "duration", "focus", "recommendations"],
+            },
+        },
+    },
+    "required": ["phases"],
+}
+
+
+def _load(text: str, key: str) -> list:
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise SchemaError(f"Response is not valid JSON: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get(key), list):
+        raise SchemaError(f"Expected an object with a '{key}' array")
+    return data[key]
+
+
+def _text(entry: dict, key: str, required: bool = True) -> str:
+    value = entry.get(key)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise SchemaError(f"'{key}' must be a non-empty string")
+    return value.strip()
+
+
+def parse_verification(text: str) -> list:
+    questions = []
+    for entry in _load(text, "questions"):
+        prerequisite = _text(entry, "prerequisite", required=False)
+        questions.append(VerificationQuestion(
+            skill=_text(entry, "skill"),
+            question=_text(entry, "question"),
+            hint=_text(entry, "hint"),
+            prerequisite=prerequisite if prerequisite and prerequisite.lower() not in NO_URL_VALUES else None,
+        ))
+    if not questions:
+        raise SchemaError("No questions returned")
+    return questions
+
+
+def parse_scores(text: str) -> list:
+    scores = []
+    for entry in _load(text, "scores"):
+        score = entry.get("score")
+        if isinstance(score, bool) or not isinstance(score, int) or not 0 <= score <= 10:
+            raise SchemaError(f"Score for {entry.get('skill')!r} must be an integer from 0 to 10")
+        scores.append(SkillScore(skill=_text(entry, "skill"), score=score))
+    if not scores:
+        raise SchemaError("No scores returned")
+    return scores
+
+
+def parse_learning_path(text: str) -> list:
+    phases = []
+    for entry in _load(text, "phases"):
+        name = _text(entry, "name")
+        if name not in PHASES:
+            raise SchemaError(f"Unknown phase {name!r}")
+        recommendations = entry.get("recommendations")
+        if not isinstance(recommendations, list):
+            raise SchemaError(f"'recommendations' for {name} must be an array")
+        phases.append(Phase(
+            name=name,
+            duration=_text(entry, "duration"),
+            focus=_text(entry, "focus"),
+            recommendations=[Recommendation(
+                skill=_text(item, "skill"),
+                type=_text(item, "type"),
+                name=_text(item, "name"),
+                url=_text(item, "url", required=False) or "",
+                rationale=_text(item, "rationale"),
+            ) for item in recommendations],
+        ))
+    if not phases:
+        raise SchemaError("No phases returned")
+    return phases
+
+
+def to_learning_path(phases: list) -> dict:
+    # Same shape the streaming LearningPathParser builds, so both modes render and export identically
+    path = empty_learning_path()
+    for phase in phases:
+        path[phase.name] = {
+            "header": f"Phase: {phase.name} - {phase.duration}",
+            "focus": phase.focus,
+            "items": [{
+                "skill": rec.skill,
+                "type": rec.type,
+                "name": rec.name,
+                "url": rec.url if rec.url.lower() not in NO_URL_VALUES else "N/A",
+                "rationale": rec.rationale,
+            } for rec in phase.recommendations],
+        }
+    return path
+
+
+def build_repair_prompt(prompt: str, response: str, error: SchemaError) -> str:
+    return (
+        f"{prompt}\n\n"
+        f"Your previous reply did not match the required JSON schema ({error}). "
+        f"Previous reply:\n{response}\n"
+        f"Return only the corrected JSON."
+    )
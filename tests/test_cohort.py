@@ -0,0 +1,43 @@
+import json
+
+from cohort import Checkpoint, load_roster, run_cohort
+
+ROWS = [
+    {"name": "Ann", "profession": "Data Scientist", "ratings": "Python=7;SQL=4"},
+    {"name": "Bo"},
+    {"name": "Cy", "profession": "Nurse", "ratings": "seven"},
+    {"name": "Di", "profession": "Nurse", "ratings": "Python"},
+    {"name": "Ed", "profession": "Nurse", "ratings": '["Python"]'},
+    {"name": "Fay", "profession": "Nurse", "ratings": '{"Python": "high"}'},
+    ["not", "an", "object"],
+]
+
+
+def write_roster(path, rows, extra_lines=()):
+    path.write_text("\n".join([json.dumps(row) for row in rows] + list(extra_lines)) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_bad_rows_become_failed_learners(tmp_path):
+    learners = load_roster(write_roster(tmp_path / "roster.jsonl", ROWS, ["{broken"]))
+    assert len(learners) == 8
+    assert learners[0]["ratings"] == {"Python": 7, "SQL": 4}
+    assert "error" not in learners[0]
+    assert [("error" in learner) for learner in learners[1:]] == [True] * 7
+    assert "profession" in learners[1]["error"]
+
+
+def test_fallback_ids_follow_row_content_not_position(tmp_path):
+    first = load_roster(write_roster(tmp_path / "a.jsonl", ROWS[:1]))[0]["id"]
+    shifted = load_roster(write_roster(tmp_path / "b.jsonl", [{"name": "Zed", "profession": "Nurse"}] + ROWS[:1]))[1]["id"]
+    assert first == shifted
+    assert load_roster(write_roster(tmp_path / "c.jsonl", [{"email": "ann@example.com", **ROWS[0]}]))[0]["id"] == "ann@example.com"
+
+
+def test_bad_rows_fail_without_stopping_the_run(tmp_path):
+    roster = write_roster(tmp_path / "roster.jsonl", ROWS[1:], ["{broken"])
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    checkpoint.write_text(json.dumps({"id": "gone-from-roster", "status": "done"}) + "\n", encoding="utf-8")
+    summary = run_cohort(roster, str(tmp_path / "out"), str(checkpoint), workers=2)
+    assert summary == {"skipped": 0, "done": 0, "failed": 7}
+    assert Checkpoint(str(checkpoint)).done == {"gone-from-roster"}
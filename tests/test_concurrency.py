@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+
+from concurrency import SingleFlight
+
+
+def test_followers_are_released_when_the_leader_is_interrupted():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def leader_call():
+        started.set()
+        release.wait(5)
+        raise KeyboardInterrupt
+
+    def leader():
+        with pytest.raises(KeyboardInterrupt):
+            flight.do("key", leader_call)
+
+    def follower():
+        try:
+            flight.do("key", lambda: "never runs")
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader_thread = threading.Thread(target=leader, daemon=True)
+    leader_thread.start()
+    started.wait(5)
+    follower_thread = threading.Thread(target=follower, daemon=True)
+    follower_thread.start()
+    # Gives the follower time to join the leader's call
+    time.sleep(0.2)
+    release.set()
+    leader_thread.join(5)
+    follower_thread.join(5)
+    assert not follower_thread.is_alive()
+    assert len(errors) == 1
+    assert flight.in_flight() == 0
+
+
+def test_leader_result_is_returned():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 42) == 42
+    assert flight.in_flight() == 0
@@ -0,0 +1,29 @@
+import pytest
+
+from gemini_client import CircuitBreaker, GeminiClient
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    return breaker
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = half_open_breaker()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_probe_is_released_after_an_unexpected_error(monkeypatch):
+    breaker = half_open_breaker()
+    client = GeminiClient("key", breaker=breaker, max_retries=0)
+
+    def post(*args, **kwargs):
+        raise ValueError("not JSON")
+
+    monkeypatch.setattr(client.session, "post", post)
+    with pytest.raises(ValueError):
+        client.post("generateContent", {})
+    assert breaker.allow()
@@ -0,0 +1,139 @@
+import ipaddress
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import urllib3.util.connection
+
+from link_check import DEAD, OK, UNVERIFIED, LinkChecker, PinnedAddressAdapter
+
+REAL_GETADDRINFO = socket.getaddrinfo
+PUBLIC_ADDRESS = "93.184.216.34"
+
+
+class FakeStore:
+    def get(self, url):
+        return None
+
+    def put(self, url, status, ttl_seconds):
+        pass
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.server.seen.append((self.path, self.headers["Host"]))
+        if self.path == "/ok":
+            self.send_response(200)
+        elif self.path == "/to-internal":
+            self.send_response(302)
+            self.send_header("Location", "http://internal.test/secret")
+        elif self.path == "/to-loopback":
+            self.send_response(302)
+            self.send_header("Location", f"http://127.0.0.1:{self.server.server_port}/secret")
+        else:
+            self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.seen = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    # Hostnames resolve through this table; IP literals still go to the real resolver
+    names = {}
+    calls = []
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            calls.append(host)
+            answers = names[host]
+            address = answers.pop(0) if len(answers) > 1 else answers[0]
+            family = socket.AF_INET6 if ":" in address else socket.AF_INET
+            return [(family, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, port))]
+        return REAL_GETADDRINFO(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    names["calls"] = calls
+    return names
+
+
+@pytest.fixture
+def dials(monkeypatch):
+    # Records where a connection would go instead of opening one
+    dialed = []
+
+    def create_connection(address, *args, **kwargs):
+        dialed.append(address[0])
+        raise ConnectionRefusedError("test: no outbound connections")
+
+    monkeypatch.setattr(urllib3.util.connection, "create_connection", create_connection)
+    return dialed
+
+
+def make_checker(allowed_hosts=frozenset()):
+    return LinkChecker(FakeStore(), timeout=2.0, max_workers=2, ttl_seconds={OK: 60, DEAD: 60, UNVERIFIED: 60},
+                       allowed_hosts=allowed_hosts)
+
+
+def check(checker, url):
+    return checker.check_all([url], timeout=10)[url][1]
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1", "::1", "169.254.169.254", "10.0.0.5", "172.16.3.4", "192.168.1.10", "::ffff:127.0.0.1"])
+def test_names_resolving_to_non_public_addresses_are_never_dialed(resolver, dials, address):
+    resolver["target.test"] = [address]
+    assert check(make_checker(), "http://target.test/page") == DEAD
+    assert dials == []
+
+
+@pytest.mark.parametrize("url", ["http://127.0.0.1/", "http://169.254.169.254/latest/meta-data/", "http://10.1.2.3:8080/", "http://[::1]/"])
+def test_non_public_address_literals_are_never_dialed(dials, url):
+    assert check(make_checker(), url) == DEAD
+    assert dials == []
+
+
+def test_rebinding_name_is_dialed_at_the_vetted_address(resolver, dials):
+    # First answer passes the check; a second lookup would point at loopback
+    resolver["rebind.test"] = [PUBLIC_ADDRESS, "127.0.0.1"]
+    assert check(make_checker(), "http://rebind.test/page") == DEAD
+    assert dials == [PUBLIC_ADDRESS]
+    assert resolver["calls"] == ["rebind.test"]
+
+
+def test_https_keeps_the_hostname_for_sni_and_certificate(resolver):
+    resolver["public.test"] = [PUBLIC_ADDRESS]
+    request = requests.Request("HEAD", "https://public.test/page").prepare()
+    host_params, pool_kwargs = PinnedAddressAdapter().build_connection_pool_key_attributes(request, True)
+    assert host_params["host"] == PUBLIC_ADDRESS
+    assert pool_kwargs["server_hostname"] == pool_kwargs["assert_hostname"] == "public.test"
+
+
+def test_allowed_host_is_dialed_with_its_host_header(resolver, server):
+    resolver["bench.test"] = ["127.0.0.1"]
+    url = f"http://bench.test:{server.server_port}/ok"
+    assert check(make_checker({"bench.test"}), url) == OK
+    assert server.seen == [("/ok", f"bench.test:{server.server_port}")]
+
+
+@pytest.mark.parametrize("path", ["/to-internal", "/to-loopback"])
+def test_redirects_to_non_public_addresses_are_not_followed(resolver, server, path):
+    resolver["bench.test"] = ["127.0.0.1"]
+    resolver["internal.test"] = ["10.0.0.5"]
+    assert check(make_checker({"bench.test"}), f"http://bench.test:{server.server_port}{path}") == DEAD
+    assert [seen_path for seen_path, _ in server.seen] == [path]
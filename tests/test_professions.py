@@ -0,0 +1,78 @@
+import pytest
+
+from professions import (
+    DEFAULT_PROFESSIONS_PATH, ProfessionIndex, load_professions, normalize_profession, within_one_edit,
+)
+
+PROFESSIONS = {
+    "Software Engineer": ["swe"],
+    "Blockchain Developer": ["web3 developer"],
+    "Sales Executive": ["account executive"],
+    "Data Scientist": [],
+    "UX Designer": ["user experience designer"],
+    "Project Manager": [],
+    "Product Manager": [],
+}
+
+
+@pytest.fixture
+def index():
+    return ProfessionIndex(PROFESSIONS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("SWE", "Software Engineer"),
+    ("  software   engineer ", "Software Engineer"),
+    ("Sofware Enginer", "Software Engineer"),
+    ("Data Scienist", "Data Scientist"),
+    ("UX Desginer", "UX Designer"),
+    ("product managr", "Product Manager"),
+])
+def test_spellings_resolve_to_curated_name(index, text, expected):
+    assert index.lookup(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "web developer",
+    "web2 developer",
+    "accounts executive",
+    "Program Manager",
+    "Senior Software Engineer",
+    "Research Scientist",
+    "Data Scientist II",
+    "Marine biologist",
+    "",
+])
+def test_near_misses_do_not_resolve(index, text):
+    assert index.lookup(text) is None
+
+
+@pytest.mark.parametrize("word, other, expected", [
+    ("enginer", "engineer", True),
+    ("desginer", "designer", True),
+    ("managr", "manager", True),
+    ("account", "accounts", True),
+    ("accountant", "accounts", False),
+    ("program", "project", False),
+    ("web", "web3", True),
+])
+def test_within_one_edit(word, other, expected):
+    assert within_one_edit(word, other) is expected
+    assert within_one_edit(other, word) is expected
+
+
+def test_curated_aliases_are_unique():
+    seen = {}
+    for profession, aliases in load_professions(DEFAULT_PROFESSIONS_PATH).items():
+        for alias in {profession, *aliases}:
+            key = normalize_profession(alias)
+            assert seen.setdefault(key, profession) == profession, f"{alias!r} maps to {seen[key]} and {profession}"
+
+
+@pytest.mark.parametrize("text", [
+    "developer", "coder", "programmer", "app developer", "graduate student", "fresher", "marketing",
+    "operations", "hr", "ui/ux designer", "account executive", "big data engineer", "etl developer",
+    "machine learning", "data science", "ds", "pharmacy", "accounting", "research scientist",
+])
+def test_curated_table_keeps_only_true_synonyms(text):
+    assert ProfessionIndex(load_professions(DEFAULT_PROFESSIONS_PATH)).lookup(text) is None
@@ -0,0 +1,26 @@
+import pytest
+
+from prompt_budget import compact_answers, estimate_tokens, truncate
+
+ENGLISH = "I have used pandas and NumPy for three years to clean, join and reshape large datasets. " * 20
+HINDI = "मैंने तीन साल तक बड़े डेटासेट को साफ करने और जोड़ने के लिए पांडas का उपयोग किया है। " * 20
+
+
+@pytest.mark.parametrize("text", [ENGLISH, HINDI])
+@pytest.mark.parametrize("max_tokens", [10, 50, 200])
+def test_truncate_stays_within_budget(text, max_tokens):
+    truncated = truncate(text, max_tokens)
+    assert estimate_tokens(truncated) <= max_tokens
+    assert truncated.endswith("…")
+    assert estimate_tokens(truncated) >= max_tokens // 2
+
+
+def test_truncate_keeps_short_text():
+    assert truncate("short answer", 10) == "short answer"
+
+
+def test_compacted_hindi_answers_fit_the_budget():
+    # One long sentence each, so it has to be cut rather than trimmed to key sentences
+    answers = {"Python": HINDI.replace("।", ","), "SQL": HINDI.replace("।", ",")}
+    compacted, _ = compact_answers(answers, {}, 100, {})
+    assert sum(map(estimate_tokens, compacted.values())) <= 100
@@ -0,0 +1,17 @@
+from resume import snapshot
+
+
+def test_failed_results_are_not_checkpointed():
+    state = {
+        "name": "Ann",
+        "suggested_skills": ["Error: Gemini is temporarily unavailable"],
+        "trending_skills": ["Error fetching trends"],
+        "selected_skills": {"Python": 5},
+        "unrelated": 1,
+    }
+    assert snapshot(state) == {"name": "Ann", "selected_skills": {"Python": 5}}
+
+
+def test_results_are_checkpointed():
+    state = {"suggested_skills": ["Python", "SQL"], "trending_skills": ["Rust"]}
+    assert snapshot(state) == state
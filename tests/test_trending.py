@@ -0,0 +1,47 @@
+import threading
+import time
+
+from trending import RateLimitBudget, TrendingCache
+
+
+class FakeResponse:
+    headers = {}
+
+    def json(self):
+        return {"data": [{"text": "Hiring: Python and SQL skills are hot"}], "meta": {}}
+
+
+class FakeClient:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.queries = []
+
+    def search_recent_tweets(self, query, **kwargs):
+        self.queries.append(query)
+        time.sleep(self.delay)
+        return FakeResponse()
+
+
+def make_cache(client, **kwargs):
+    return TrendingCache(client, ttl_seconds=3600, budget=RateLimitBudget(450, 900), **kwargs)
+
+
+def test_entries_are_bounded_least_recently_used_first():
+    cache = make_cache(FakeClient(), max_entries=2)
+    cache.get("Nurse")
+    cache.get("Teacher")
+    cache.get("Nurse")
+    cache.get("Marine biologist")
+    assert list(cache.entries) == ["nurse", "marine biologist"]
+
+
+def test_key_locks_are_released_after_each_fetch():
+    client = FakeClient(delay=0.05)
+    cache = make_cache(client)
+    threads = [threading.Thread(target=cache.get, args=(profession,)) for profession in ["Nurse"] * 5 + ["Teacher"] * 3]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(client.queries) == 2
+    assert cache._key_locks == {}
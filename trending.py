@@ -0,0 +1,245 @@
+import threading
+import time
+from collections import OrderedDict
+
+from requests.adapters import HTTPAdapter
+
+from config import get_setting
+from metrics import metrics
+from professions import profession_key
+from skill_extraction import get_skill_matcher
+
+
+X_API_HOST = "https://api.twitter.com"
+
+
+class TrendingUnavailableError(Exception):
+    pass
+
+
+class RebasedAdapter(HTTPAdapter):
+    # tweepy hardcodes X_API_HOST; this sends its requests to a proxy or local stand-in instead
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        request.url = self.base_url + request.url[len(X_API_HOST):]
+        return super().send(request, **kwargs)
+
+
+def extract_trending_skills(texts: list, k: int = 5) -> list:
+    trending_skills = get_skill_matcher().top_k(texts, k=k)
+    return trending_skills or ["No trending skills found"]
+
+
+class RateLimitBudget:
+    # Token bucket sized to X's recent-search window, corrected by the x-rate-limit-* headers
+    def __init__(self, capacity: int, window_seconds: float):
+        self.capacity = capacity
+        self.refill_rate = capacity / window_seconds
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return 0.0 if time.time() < self.blocked_until else self.tokens
+
+    def try_acquire(self, reserve: float = 0) -> bool:
+        with self._lock:
+            self._refill()
+            if time.time() < self.blocked_until or self.tokens - 1 < reserve:
+                return False
+            self.tokens -= 1
+            return True
+
+    def update_from_headers(self, headers):
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        with self._lock:
+            self._refill()
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining))
+            if remaining is not None and reset is not None and int(remaining) == 0:
+                self.blocked_until = float(reset)
+
+
+class TrendingCache:
+    def __init__(self, client, ttl_seconds: float, budget: RateLimitBudget,
+                 refresh_reserve: int = 20, hot_size: int = 20, refresh_interval: float = 60.0,
+                 max_pages: int = 10, page_size: int = 100, max_entries: int = 1000):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.budget = budget
+        self.refresh_reserve = refresh_reserve
+        self.hot_size = hot_size
+        self.refresh_interval = refresh_interval
+        self.max_pages = max_pages
+        self.page_size = page_size
+        self.max_entries = max_entries
+        # Keyed by user-typed professions, so both are bounded: entries as an LRU, and a key's lock
+        # only while a request for it is fetching or waiting
+        self.entries = OrderedDict()
+        self.access_counts = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._refresher = None
+
+    def search(self, profession: str, reserve: float = 0) -> list:
+        # Each page costs one request from the budget; later pages are skipped rather than
+        # blocking when the budget runs low, so we analyze as many tweets as we can afford
+        from tweepy import TooManyRequests
+        query = f"trending skills {profession} -is:retweet"
+        texts = []
+        next_token = None
+        for page in range(self.max_pages):
+            if not self.budget.try_acquire(reserve):
+                if page == 0:
+                    raise TrendingUnavailableError("X rate-limit budget exhausted")
+                break
+            try:
+                with metrics.timer("elevatiq_x_search_seconds"):
+                    response = self.client.search_recent_tweets(
+                        query=query, max_results=self.page_size, tweet_fields=["created_at"], next_token=next_token
+                    )
+            except TooManyRequests as e:
+                metrics.inc("elevatiq_x_rate_limited_total")
+                self.budget.update_from_headers(e.response.headers)
+                if page == 0:
+                    raise
+                break
+            self.budget.update_from_headers(response.headers)
+            payload = response.json()
+            texts.extend(tweet["text"] for tweet in payload.get("data", []))
+            next_token = payload.get("meta", {}).get("next_token")
+            if not next_token:
+                break
+        return texts
+
+    def refresh(self, profession: str, reserve: float = 0) -> list:
+        skills = extract_trending_skills(self.search(profession, reserve))
+        key = profession_key(profession)
+        with self._lock:
+            self.entries[key] = {"profession": profession, "skills": skills, "fetched_at": time.time()}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return skills
+
+    def _fresh_entry(self, key: str):
+        entry = self.entries.get(key)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            return entry
+        return None
+
+    def get(self, profession: str) -> list:
+        key = profession_key(profession)
+        with self._lock:
+            self.access_counts[key] = self.access_counts.get(key, 0) + 1
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            entry = self._fresh_entry(key)
+            if entry is None:
+                key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+                key_lock[1] += 1
+        if entry is not None:
+            metrics.inc("elevatiq_trending_cache_total", result="hit")
+            return entry["skills"]
+        try:
+            return self._fetch(profession, key, key_lock[0])
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._key_locks[key]
+
+    def _fetch(self, profession: str, key: str, key_lock: threading.Lock) -> list:
+        from tweepy import TooManyRequests
+        # Only one session per profession goes to X; the rest wait for its result
+        with key_lock:
+            with self._lock:
+                entry = self._fresh_entry(key)
+            if entry is not None:
+                metrics.inc("elevatiq_trending_cache_total", result="hit")
+                return entry["skills"]
+            metrics.inc("elevatiq_trending_cache_total", result="miss")
+            try:
+                return self.refresh(profession)
+            except (TrendingUnavailableError, TooManyRequests):
+                with self._lock:
+                    stale = self.entries.get(key)
+                if stale is not None:
+                    metrics.inc("elevatiq_trending_stale_served_total")
+                    return stale["skills"]
+                raise
+
+    def hot_professions(self) -> list:
+        with self._lock:
+            ranked = sorted(self.access_counts.items(), key=lambda item: item[1], reverse=True)
+            return [self.entries[key]["profession"] for key, _ in ranked[:self.hot_size] if key in self.entries]
+
+    def start_refresher(self):
+        if self._refresher is None:
+            self._refresher = threading.Thread(target=self._refresh_loop, name="elevatiq-trending-refresher", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            for profession in self.hot_professions():
+                with self._lock:
+                    entry = self.entries.get(profession_key(profession))
+                # Refresh ahead of expiry, but never dip into the budget kept for live user requests
+                if entry and time.time() - entry["fetched_at"] > self.ttl_seconds * 0.8:
+                    try:
+                        self.refresh(profession, reserve=self.refresh_reserve)
+                    except TrendingUnavailableError:
+                        break
+                    except Exception:
+                        continue
+            with self._lock:
+                # Halve access counts so hotness tracks recent demand
+                self.access_counts = {key: count // 2 for key, count in self.access_counts.items() if count > 1}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_trending_cache() -> TrendingCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            # tweepy (and the X client) are only loaded once trending skills are first requested
+            import requests
+            import tweepy
+            client = tweepy.Client(bearer_token=get_setting("x_api", "bearer_token"), return_type=requests.Response)
+            base_url = get_setting("x_api", "base_url")
+            if base_url:
+                client.session.mount(X_API_HOST, RebasedAdapter(base_url))
+            _cache = TrendingCache(
+                client,
+                ttl_seconds=get_setting("trending", "ttl_seconds", 6 * 3600),
+                budget=RateLimitBudget(
+                    get_setting("trending", "rate_limit", 450),
+                    get_setting("trending", "rate_limit_window_seconds", 900),
+                ),
+                refresh_reserve=get_setting("trending", "refresh_reserve", 20),
+                hot_size=get_setting("trending", "hot_size", 20),
+                refresh_interval=get_setting("trending", "refresh_interval_seconds", 60),
+                max_pages=get_setting("trending", "max_pages", 10),
+                page_size=get_setting("trending", "page_size", 100),
+                max_entries=get_setting("trending", "max_entries", 1000),
+            )
+            _cache.start_refresher()
+            metrics.register_gauge("elevatiq_trending_cache_entries", lambda: len(_cache.entries))
+            metrics.register_gauge("elevatiq_x_budget_available", _cache.budget.available)
+        return _cache